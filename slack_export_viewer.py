@@ -1,20 +1,34 @@
+import csv
 import json
 import os
+import posixpath
+import re
 import sys
 import argparse
-import urllib.request
 import shutil
-from datetime import datetime, timedelta, timezone, date
+from datetime import datetime, timezone, date
 import hashlib
-from typing import List, Dict, Set
+from typing import Iterator, List, Dict, Set
 import logging
 import zipfile
-import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from functools import partial
+from functools import lru_cache, partial
+from operator import attrgetter, itemgetter
+from string import Template
 from types import SimpleNamespace
+from dataclasses import dataclass, field
 from pydantic import BaseModel
-import html
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 def setup_logging():
     """Configure logging for the application"""
@@ -38,36 +52,661 @@ def log(level, message, **kwargs):
         message = message.format(**kwargs)
     log_func(message)
 
+@dataclass
+class ChannelScan:
+    """Totals gathered in a single pass over a channel's message files"""
+    messages: int = 0  # Messages in day files
+    attachments: int = 0
+    threads: Set[str] = field(default_factory=set)  # thread_ts values seen
+    earliest_date: datetime | None = None
+    latest_date: datetime | None = None
+    monthly_counts: Dict[str, int] = field(default_factory=dict)  # 'YYYY-MM' -> messages
+    user_counts: Dict[str, int] = field(default_factory=dict)  # user_id -> messages in any .json file
+    
+    def add_file(self, filename: str, messages: List[Dict]) -> None:
+        """Add the messages of one of the channel's .json files to the totals"""
+        # Users are counted in every file, including non-date ones like canvases
+        for msg in messages:
+            user_id = msg.get('user')
+            if user_id:
+                self.user_counts[user_id] = self.user_counts.get(user_id, 0) + 1
+        
+        # Everything else only counts per-day message files
+        match = _DAY_FILE_RE.match(filename)
+        if not match:
+            return
+        
+        # Track date range from filenames (the regex already checked the format)
+        try:
+            date = datetime(int(filename[:4]), int(filename[5:7]), int(filename[8:10]))
+        except ValueError:
+            return  # e.g. 2024-02-30.json
+        if not self.earliest_date or date < self.earliest_date:
+            self.earliest_date = date
+        if not self.latest_date or date > self.latest_date:
+            self.latest_date = date
+        
+        month_key = match.group(1)
+        self.monthly_counts[month_key] = self.monthly_counts.get(month_key, 0) + len(messages)
+        self.messages += len(messages)
+        for msg in messages:
+            if 'files' in msg:
+                self.attachments += len(msg['files'])
+            if 'thread_ts' in msg:
+                self.threads.add(msg['thread_ts'])
+
+@dataclass(slots=True)
+class FileRec:
+    """One row of a channel's missing or downloaded files report"""
+    timestamp: str  # Slack ts of the message the file belongs to
+    file_id: str
+    mode: str
+    ts: float = field(init=False)  # Parsed timestamp, for sorting
+    
+    def __post_init__(self):
+        self.ts = float(self.timestamp)
+
+# Number of files downloaded concurrently, shared between channel worker processes
+DOWNLOAD_WORKERS = 16
+
+# Buffer size for writing downloads to disk (large attachments need far fewer writes)
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Buffer size for the generated channel pages, which are streamed to disk in small chunks
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Headers to mimic a browser request
+DOWNLOAD_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Referer': 'https://www.google.com'
+}
+
+# Per-day message files are named YYYY-MM-DD.json; group 1 is the month key
+_DAY_FILE_RE = re.compile(r'^(\d{4}-(?:0[1-9]|1[0-2]))-(?:0[1-9]|[12]\d|3[01])\.json$')
+
+# English month names by month number, so date ranges don't go through strftime('%B')
+_MONTH_NAMES = ['', 'January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December']
+
+def _msg_ts(msg: Dict) -> float:
+    """Sort key for messages: the timestamp parsed by process_channel, or parsed here for plain messages"""
+    ts = msg.get('_ts_float')
+    return float(msg['ts']) if ts is None else ts
+
+@lru_cache(maxsize=4096)
+def _fmt_ts(ts: str) -> str:
+    """Format a Slack timestamp as local 'YYYY-MM-DD HH:MM:SS'; cached because a message's
+    files all carry its timestamp in the file reports"""
+    return datetime.fromtimestamp(float(ts)).strftime('%Y-%m-%d %H:%M:%S')
+
+def _write_file_report(report_path: str, files: List[FileRec]) -> None:
+    """Write file records to a CSV report (timestamp, file_id, mode), oldest first"""
+    rows = sorted(files, key=attrgetter('ts'))
+    with open(report_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(('timestamp', 'file_id', 'mode'))
+        writer.writerows((_fmt_ts(file.timestamp), file.file_id, file.mode) for file in rows)
+
+def _format_month_range(earliest: datetime, latest: datetime) -> str:
+    """Format a date range as e.g. 'March 2024', 'March - May 2024' or 'March 2024 - May 2025'"""
+    if earliest.year == latest.year:
+        if earliest.month == latest.month:
+            return f"{_MONTH_NAMES[earliest.month]} {earliest.year}"
+        return f"{_MONTH_NAMES[earliest.month]} - {_MONTH_NAMES[latest.month]} {latest.year}"
+    return f"{_MONTH_NAMES[earliest.month]} {earliest.year} - {_MONTH_NAMES[latest.month]} {latest.year}"
+
+# Attachments shown inline as images (a tuple so str.endswith can take it directly)
+_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')
+
+# User mentions in message text look like <@U012AB3CD>
+_MENTION_RE = re.compile(r'<@([^>]+)>')
+
+# Slack markup in message text: <@U123> mentions, <#C123|name> channels, <!here> commands and
+# <https://...|label> links. Splitting on it puts the tokens (without brackets) at odd indexes.
+_SLACK_TOKEN_RE = re.compile(r'<([@#!][^<>]+|(?:https?|mailto):[^<>]+)>')
+
+# Same replacements as html.escape(quote=True), done in a single str.translate pass
+_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+_ESCAPE_SCAN = re.compile(r'[&<>"\']')
+
+def _escape_html(text: str) -> str:
+    """HTML-escape text; most text has nothing to escape and is returned as-is"""
+    match = _ESCAPE_SCAN.search(text)
+    if match is None:
+        return text
+    start = match.start()
+    return text[:start] + text[start:].translate(_ESCAPE_TABLE)
+
+def _render_text_item(item: Dict) -> str:
+    return _escape_html(item['text'])
+
+def _render_link_item(item: Dict) -> str:
+    # Escape the text but not the URL
+    text = _escape_html(item.get("text", item["url"]))
+    return f'<a href="{item["url"]}">{text}</a>'
+
+def _render_emoji_item(item: Dict) -> str:
+    return f':{item["name"]}:'
+
+# rich_text_section element type -> HTML renderer
+_RICH_TEXT_RENDERERS = {
+    'text': _render_text_item,
+    'link': _render_link_item,
+    'emoji': _render_emoji_item,
+}
+
+_CHANNEL_PAGE_HEAD = """
+    <style>
+        body { 
+            font-family: Arial, sans-serif; 
+            margin: 20px; 
+        }
+        .message { 
+            margin: 10px 0; 
+            padding: 10px; 
+            border-bottom: 1px solid #eee; 
+        }
+        .timestamp { 
+            color: #666; 
+            font-size: 0.8em; 
+        }
+        .user { 
+            font-weight: bold; 
+            color: #1264A3; 
+        }
+        .attachment { 
+            margin: 10px 0; 
+        }
+        .attachment img { 
+            max-width: 400px; 
+        }
+        .failed-download { 
+            color: #666;
+            font-style: italic;
+        }
+        nav { 
+            margin-bottom: 20px; 
+        }
+        .thumbnail {
+            max-width: 200px;
+            max-height: 200px;
+            object-fit: contain;
+            cursor: pointer;
+        }
+        .thumbnail-link {
+            display: inline-block;
+            text-decoration: none;
+        }
+        .thread-toggle {
+            color: #1264A3;
+            text-decoration: none;
+            font-size: 0.9em;
+            margin-top: 5px;
+            cursor: pointer;
+        }
+        .thread-toggle:hover {
+            text-decoration: underline;
+        }
+        .thread-container {
+            margin-left: 20px;
+            border-left: 2px solid #eee;
+            padding-left: 10px;
+            display: none;
+        }
+        .thread-container.expanded {
+            display: block;
+        }
+        .thread-controls {
+            margin-bottom: 20px;
+            padding: 10px;
+            background: #f8f8f8;
+            border-radius: 5px;
+        }
+        .thread-controls a {
+            color: #1264A3;
+            text-decoration: none;
+            margin-right: 20px;
+            cursor: pointer;
+        }
+        .thread-controls a:hover {
+            text-decoration: underline;
+        }
+        .reply-count {
+            color: #666;
+            font-size: 0.9em;
+        }
+        .file {
+            margin: 10px 0;
+        }
+
+        .image-container {
+            margin: 10px 0;
+            max-width: 800px;
+        }
+
+        .message-image {
+            max-width: 100%;
+            height: auto;
+            border-radius: 4px;
+            display: block;
+            margin-bottom: 8px;
+        }
+
+        .image-caption {
+            font-size: 0.9em;
+            color: #666;
+        }
+
+        .image-caption a {
+            color: #1264A3;
+            text-decoration: none;
+        }
+
+        .image-caption a:hover {
+            text-decoration: underline;
+        }
+
+        .file-link {
+            margin: 5px 0;
+        }
+
+        .file-link a {
+            color: #1264A3;
+            text-decoration: none;
+            display: inline-flex;
+            align-items: center;
+            padding: 6px 12px;
+            background: #f8f9fa;
+            border-radius: 4px;
+        }
+
+        .file-link a:hover {
+            background: #e9ecef;
+            text-decoration: none;
+        }
+
+        .text {
+            white-space: pre-line;  /* Preserve line breaks but not spaces */
+            word-wrap: break-word;  /* Break long words */
+            margin: 8px 0;
+        }
+    </style>
+    <script>
+        function toggleThread(threadId) {
+            const container = document.getElementById('thread-' + threadId);
+            container.classList.toggle('expanded');
+
+            const toggle = document.getElementById('toggle-' + threadId);
+            const replies = toggle.getAttribute('data-replies');
+            if (container.classList.contains('expanded')) {
+                toggle.textContent = 'Hide thread (' + replies + ' replies) ↑';
+            } else {
+                toggle.textContent = 'Show thread (' + replies + ' replies) ↓';
+            }
+        }
+
+        function expandAllThreads() {
+            document.querySelectorAll('.thread-container').forEach(container => {
+                container.classList.add('expanded');
+            });
+            document.querySelectorAll('.thread-toggle').forEach(toggle => {
+                const replies = toggle.getAttribute('data-replies');
+                toggle.textContent = 'Hide thread (' + replies + ' replies) ↑';
+            });
+        }
+
+        function collapseAllThreads() {
+            document.querySelectorAll('.thread-container').forEach(container => {
+                container.classList.remove('expanded');
+            });
+            document.querySelectorAll('.thread-toggle').forEach(toggle => {
+                const replies = toggle.getAttribute('data-replies');
+                toggle.textContent = 'Show thread (' + replies + ' replies) ↓';
+            });
+        }
+    </script>
+""".encode('utf-8')
+
+_CHANNEL_PAGE_FOOT = b"""
+</body>
+</html>
+"""
+
+_THREAD_PAGE_HEAD = """
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        .message { margin: 10px 0; padding: 10px; border-bottom: 1px solid #eee; }
+        .timestamp { color: #666; font-size: 0.8em; }
+        .user { font-weight: bold; color: #1264A3; }
+        .attachment { margin: 10px 0; }
+        .attachment img { max-width: 400px; }
+        .failed-download { 
+            color: #666;
+            font-style: italic;
+        }
+        nav { margin-bottom: 20px; }
+        .thumbnail {
+            max-width: 200px;
+            max-height: 200px;
+            object-fit: contain;
+            cursor: pointer;
+        }
+        .thumbnail-link {
+            display: inline-block;
+            text-decoration: none;
+        }
+        .thread-header {
+            margin-bottom: 30px;
+        }
+        .thread-info {
+            color: #666;
+            font-size: 0.9em;
+            margin-top: 5px;
+        }
+    </style>
+"""
+
+# Thread page parts around the static _THREAD_PAGE_HEAD styles, filled in with str.format_map
+_THREAD_PAGE_TITLE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Thread in #{channel}</title>"""
+
+_THREAD_PAGE_INTRO = """</head>
+<body>
+    <nav>
+        <a href="index.html">← Back to #{channel}</a>
+    </nav>
+    <div class="thread-header">
+        <h2>Thread in #{channel}</h2>
+        <div class="thread-info">Started by {parent_user} on {parent_time}</div>
+    </div>
+"""
+
+_THREAD_PAGE_FOOT = """
+</body>
+</html>
+"""
+
+_INDEX_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Slack Export</title>
+    <style>
+        body { 
+            font-family: Arial, sans-serif; 
+            margin: 0 auto;
+            padding: 20px;
+            max-width: 1200px;
+            background: #f5f5f5;
+        }
+        #channels-container {
+            list-style: none;
+            padding: 0;
+        }
+        .channel-item { 
+            margin: 15px 0; 
+            padding: 20px;
+            border-radius: 8px;
+            background: white;
+            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+            display: flex;  /* Make it a flex container */
+            align-items: flex-start;  /* Align items to top */
+            gap: 20px;     /* Space between content and graph */
+        }
+        .channel-name { 
+            font-size: 1.2em;
+            font-weight: bold;
+            color: #1264A3;
+            text-decoration: none;
+        }
+        .channel-name:hover {
+            text-decoration: underline;
+        }
+        .channel-stats { 
+            color: #666;
+            margin-left: 10px;
+            font-size: 0.9em;
+        }
+        .channel-content {
+            flex: 1;       /* Take up remaining space */
+            min-width: 0;  /* Allow content to shrink */
+        }
+        .channel-main {
+            margin-bottom: 10px;
+        }
+        .activity-container {
+            width: 300px;  /* Fixed width for the graph */
+            flex-shrink: 0; /* Don't shrink the graph */
+        }
+        .activity-graph { 
+            display: flex;
+            align-items: flex-end;
+            height: 40px;
+            gap: 1px;
+        }
+        .activity-bar {
+            flex: 1;
+            background-color: #1264A3;
+            opacity: 0.7;
+            transition: height 0.2s ease;
+        }
+        .activity-bar:hover {
+            opacity: 1;
+        }
+        .details {
+            display: none;  /* Hidden by default */
+            margin: 10px 0;
+            padding: 15px;
+            background: #f8f9fa;
+            border-radius: 6px;
+            font-size: 0.9em;
+        }
+        .details.show {
+            display: block;  /* Show when .show class is added */
+        }
+        .details-toggle {
+            color: #1264A3;
+            cursor: pointer;
+            font-size: 0.9em;
+            text-decoration: none;
+            padding: 4px 8px;
+            border-radius: 4px;
+            background: #f0f0f0;
+            margin-left: 10px;
+        }
+        .details-toggle:hover {
+            background: #e0e0e0;
+        }
+        .global-controls {
+            margin: 10px 0 20px 0;
+        }
+        .global-controls a {
+            color: #1264A3;
+            text-decoration: none;
+            margin-right: 20px;
+            cursor: pointer;
+        }
+        .global-controls a:hover {
+            text-decoration: underline;
+        }
+    </style>
+</head>
+<body>
+    <h1>Slack Export</h1>
+    
+    <div class="global-controls">
+        <a onclick="expandAllDetails()">Expand All Details</a>
+        <a onclick="collapseAllDetails()">Collapse All Details</a>
+    </div>
+    
+    <div class="sort-buttons">
+        <button id="sort-alpha">Sort Alphabetically</button>
+        <button id="sort-recent">Sort by Recently Active</button>
+        <button id="sort-active">Sort by Most Active</button>
+    </div>
+    
+    <div id="channels-container">"""
+
+_INDEX_CHANNEL_ITEM = Template("""
+            <li class="channel-item" 
+                data-name="$name"
+                data-recent-activity="$recent_activity"
+                data-message-count="$message_count">
+                <div class="channel-content">
+                    <div class="channel-main">
+                        <a href="$name/index.html" class="channel-name">#$name</a>
+                        <span class="channel-stats">
+                            $messages messages • 
+                            $threads threads • 
+                            $attachments files
+                            $date_range
+                        </span>
+                        <a class="details-toggle" id="toggle-details-$name" 
+                           onclick="toggleDetails('$name')">Show Details ↓</a>
+                    </div>
+                    <div class="details" id="details-$name">
+                        <strong>Users:</strong><br>
+                        $user_list<br><br>
+                        <strong>Summary:</strong><br>
+                        $summary
+                    </div>
+                    <span class="user-list">$user_text</span>
+                </div>
+                $activity
+            </li>
+            """)
+
+_INDEX_TAIL = """
+        </div>
+        <script>
+            function expandAllDetails() {
+                document.querySelectorAll('.details').forEach(details => {
+                    details.classList.add('show');
+                    const toggle = document.getElementById('toggle-details-' + details.id.replace('details-', ''));
+                    if (toggle) toggle.textContent = 'Hide Details ↑';
+                });
+            }
+            
+            function collapseAllDetails() {
+                document.querySelectorAll('.details').forEach(details => {
+                    details.classList.remove('show');
+                    const toggle = document.getElementById('toggle-details-' + details.id.replace('details-', ''));
+                    if (toggle) toggle.textContent = 'Show Details ↓';
+                });
+            }
+
+            function toggleDetails(channelId) {
+                const details = document.getElementById('details-' + channelId);
+                const toggle = document.getElementById('toggle-details-' + channelId);
+                if (details.classList.contains('show')) {
+                    details.classList.remove('show');
+                    toggle.textContent = 'Show Details ↓';
+                } else {
+                    details.classList.add('show');
+                    toggle.textContent = 'Hide Details ↑';
+                }
+                return false;  // Prevent default link behavior
+            }
+
+            document.addEventListener('DOMContentLoaded', function() {
+                function sortChannels(method) {
+                    const container = document.getElementById('channels-container');
+                    const channels = Array.from(container.getElementsByClassName('channel-item'));
+                    
+                    channels.sort((a, b) => {
+                        if (method === 'alpha') {
+                            return a.getAttribute('data-name').localeCompare(b.getAttribute('data-name'));
+                        } else if (method === 'recent') {
+                            const aDate = a.getAttribute('data-recent-activity') || '';
+                            const bDate = b.getAttribute('data-recent-activity') || '';
+                            return bDate.localeCompare(aDate);
+                        } else if (method === 'active') {
+                            const aCount = parseInt(a.getAttribute('data-message-count') || '0');
+                            const bCount = parseInt(b.getAttribute('data-message-count') || '0');
+                            return bCount - aCount;
+                        }
+                    });
+                    
+                    channels.forEach(channel => {
+                        container.removeChild(channel);
+                        container.appendChild(channel);
+                    });
+                }
+
+                document.getElementById('sort-alpha').addEventListener('click', () => sortChannels('alpha'));
+                document.getElementById('sort-recent').addEventListener('click', () => sortChannels('recent'));
+                document.getElementById('sort-active').addEventListener('click', () => sortChannels('active'));
+            });
+        </script>
+    </body>
+</html>"""
+
 class SlackExportViewer:
-    def __init__(self, output_dir: str = "output", zip_path: str = None):
+    def __init__(self, output_dir: str = "output", zip_path: str = None, download_workers: int = DOWNLOAD_WORKERS):
         setup_logging()  # Initialize logging
         self.output_dir = output_dir
         self.zip_path = zip_path
-        self.temp_dir = None
+        self._zip = None
+        self._zip_index: Dict[str, zipfile.ZipInfo] = {}  # member name -> info
+        self._zip_dirs: Dict[str, Dict[str, bool]] = {}  # directory -> {child name -> is_dir}
+        self._name_index: Dict[str, str] = {}  # file name -> first member with that name
         self.channels_data = {}
         self.users_data = {}  # Add users data storage
+        self._username_cache: Dict[str, str] = {}  # user_id -> display name
         self.processed_attachments: Set[str] = set()
         self.failed_downloads: Set[str] = set()
         self.channel_files: Dict[str, Dict[str, str]] = {}  # channel -> {file_id -> local_path}
+        self._files_index: Dict[str, Dict[str, str]] = {}  # files_dir -> {file_id -> path}
+        self._channel_scans: Dict[str, ChannelScan | None] = {}  # channel -> scan totals
+        self._channel_dirs: Dict[str, tuple[str, str]] = {}  # channel -> (output dir, files dir)
+        self._summary_cache: Dict[str, tuple[int, str]] = {}  # summary.txt path -> (mtime_ns, contents)
+        self._export_info: Dict[str, str] | None = None  # Set by get_export_info
         self.shown_images: Set[str] = set()  # Track which images we've shown inline
         self.logged_warnings = set()  # Track which warnings we've already logged
+        self.channel_pending_downloads: Dict[str, List[tuple]] = {}  # channel -> queued downloads
+        self.channel_missing_files: Dict[str, List[FileRec]] = defaultdict(list)  # channel -> report rows
+        self.channel_downloaded_files: Dict[str, List[FileRec]] = defaultdict(list)  # channel -> report rows
+        self._pool = ThreadPoolExecutor(max_workers=download_workers)  # Downloads are network-bound
+        self._lock = threading.Lock()  # Guards state shared with download threads
+        self._inflight: Dict[tuple[str, str], Future] = {}  # (channel, file_id) -> download
+        
+        # One pooled HTTP session so connections and TLS handshakes are reused across downloads
+        self._session = requests.Session()
+        self._session.headers.update(DOWNLOAD_HEADERS)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=download_workers)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
         
         if zip_path:
             self.setup_zip_environment()
     
     def setup_zip_environment(self):
-        """Extract zip file to temporary directory"""
-        self.temp_dir = tempfile.mkdtemp()
-        log('info', 'Extracting zip file to temporary directory: {dir}', dir=self.temp_dir)
+        """Open the zip file and index its members so data can be read without extracting"""
+        log('info', 'Reading zip file: {path}', path=self.zip_path)
         
         try:
-            with zipfile.ZipFile(self.zip_path, 'r') as zip_ref:
-                zip_ref.extractall(self.temp_dir)
+            self._zip = zipfile.ZipFile(self.zip_path, 'r')
         except Exception as e:
-            log('error', 'Failed to extract zip file: {error}', error=str(e))
-            if self.temp_dir:
-                shutil.rmtree(self.temp_dir)
+            log('error', 'Failed to open zip file: {error}', error=str(e))
             sys.exit(1)
+        
+        for info in self._zip.infolist():
+            name = info.filename.rstrip('/')
+            if not info.is_dir():
+                self._zip_index[name] = info
+                self._name_index.setdefault(posixpath.basename(name), name)
+            
+            # Register the member and all of its parent directories
+            parts = name.split('/')
+            for depth, part in enumerate(parts):
+                children = self._zip_dirs.setdefault('/'.join(parts[:depth]), {})
+                is_dir = depth < len(parts) - 1 or info.is_dir()
+                children[part] = children.get(part, False) or is_dir
+            if info.is_dir():
+                self._zip_dirs.setdefault(name, {})
     
     def get_data_path(self, path: str) -> str:
         """Get the correct path for data files whether using zip or direct files"""
@@ -75,32 +714,55 @@ class SlackExportViewer:
             # Remove 'export_data/' prefix if it exists
             clean_path = path.replace('export_data/', '', 1)
             
-            # Look for the file in the temp directory
-            full_path = os.path.join(self.temp_dir, clean_path)
-            if os.path.exists(full_path):
-                return full_path
+            # Look for the member in the zip file
+            if clean_path in self._zip_index or clean_path in self._zip_dirs:
+                return clean_path
             
             # If not found, try looking for just the filename
-            filename = os.path.basename(path)
-            for root, _, files in os.walk(self.temp_dir):
-                if filename in files:
-                    return os.path.join(root, filename)
-            
-            return full_path  # Return the clean path even if not found
+            # (returns the clean path even if not found)
+            return self._name_index.get(posixpath.basename(path), clean_path)
         return path
 
-    def __del__(self):
-        """Cleanup temporary directory if it exists"""
-        if self.temp_dir and os.path.exists(self.temp_dir):
-            log('info', f"Cleaning up temporary directory: {self.temp_dir}")
-            shutil.rmtree(self.temp_dir)
+    def data_exists(self, path: str) -> bool:
+        """Check whether a path returned by get_data_path exists"""
+        if self._zip:
+            return path in self._zip_index or path in self._zip_dirs
+        return os.path.exists(path)
+
+    def read_data(self, path: str) -> bytes:
+        """Read the whole of a data file returned by get_data_path"""
+        if self._zip:
+            return self._zip.read(self._zip_index[path])
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def list_data_dir(self, path: str) -> List[tuple[str, bool]]:
+        """List (name, is_dir) pairs for a data directory returned by get_data_path"""
+        if self._zip:
+            return list(self._zip_dirs.get(path, {}).items())
+        # DirEntry.is_dir() uses the type from the directory read, so no stat per entry
+        with os.scandir(path) as entries:
+            return [(entry.name, entry.is_dir(follow_symlinks=False)) for entry in entries]
+
+    def close(self) -> None:
+        """Release the download pool, HTTP session and zip file"""
+        self._pool.shutdown()
+        self._session.close()
+        if self._zip:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def load_channels(self, channels_file: str) -> None:
         """Load and parse the channels.json file"""
         try:
-            with open(channels_file, 'r') as f:
-                channels = json.load(f)
-                self.channels_data = {c['name']: c for c in channels}
+            channels = _loads(self.read_data(channels_file))
+            self.channels_data = {c['name']: c for c in channels}
         except Exception as e:
             log('error', f"Failed to load channels file: {e}")
             sys.exit(1)
@@ -108,39 +770,117 @@ class SlackExportViewer:
     def load_users(self, users_file: str) -> None:
         """Load and parse the users.json file"""
         try:
-            with open(users_file, 'r') as f:
-                users = json.load(f)
-                self.users_data = {u['id']: u for u in users}
+            users = _loads(self.read_data(users_file))
+            self.users_data = {u['id']: u for u in users}
+            self.build_username_cache()
         except Exception as e:
             log('error', f"Failed to load users file: {e}")
             sys.exit(1)
 
+    def build_username_cache(self) -> None:
+        """Resolve every loaded user's display name once"""
+        self._username_cache = {}
+        for user_id, user in self.users_data.items():
+            profile = user.get('profile') or {}
+            
+            # Try different name fields in order of preference
+            self._username_cache[user_id] = (profile.get('display_name') or 
+                                             profile.get('real_name') or 
+                                             user.get('name') or 
+                                             user_id)
+
+    @property
+    def usernames(self) -> Dict[str, str]:
+        """The resolved {user_id: display name} cache"""
+        return self._username_cache
+
+    @usernames.setter
+    def usernames(self, usernames: Dict[str, str]) -> None:
+        # Lets a worker reuse names resolved by the main process instead of loading users.json
+        self._username_cache = usernames
+
     def get_username(self, user_id: str) -> str:
         """Get user's display name or real name"""
-        if user_id not in self.users_data:
-            return user_id
-        
-        user = self.users_data[user_id]
-        profile = user.get('profile', {})
-        
-        # Try different name fields in order of preference
-        return (profile.get('display_name') or 
-                profile.get('real_name') or 
-                user.get('name') or 
-                user_id)
+        return self._username_cache.get(user_id, user_id)
+
+    def _mention_to_username(self, match: re.Match) -> str:
+        username = self._username_cache.get(match.group(1))
+        return match.group(0) if username is None else f'@{username}'
+
+    def _render_token(self, token: str) -> str:
+        """Render one Slack token (the text between < and >) as escaped HTML"""
+        target, _, label = token.partition('|')
+        kind = target[0]
+        if kind == '@':
+            username = self._username_cache.get(target[1:])
+            if username is None:
+                return _escape_html(f'<{token}>')  # Unknown user, show as-is
+            return _escape_html(f'@{username}')
+        if kind == '#':
+            return _escape_html(f'#{label or target[1:]}')
+        if kind == '!':
+            # <!here>, <!channel>, <!subteam^ID|@team>, <!date^...|fallback>
+            return _escape_html(label or f'@{target[1:]}')
+        url = _escape_html(target)
+        return f'<a href="{url}" target="_blank">{_escape_html(label or target)}</a>'
+
+    def render_slack_text(self, text: str) -> str:
+        """Convert Slack message text to HTML, resolving mentions, channels and links"""
+        if '<' not in text:
+            return _escape_html(text)
+        # Tokenize in C and escape the plain text between tokens a whole run at a time,
+        # so Python code only runs once per token rather than once per special character
+        pieces = _SLACK_TOKEN_RE.split(text)
+        for i in range(0, len(pieces), 2):
+            pieces[i] = _escape_html(pieces[i])
+        for i in range(1, len(pieces), 2):
+            pieces[i] = self._render_token(pieces[i])
+        return ''.join(pieces)
+
+    def replace_mentions(self, text: str) -> str:
+        """Replace <@user_id> mentions of known users with @username"""
+        if '<@' not in text:
+            return text
+        return _MENTION_RE.sub(self._mention_to_username, text)
+
+    def _get_files_index(self, files_dir: str) -> Dict[str, str]:
+        """
+        Return a {file_id: path} index of a files directory, scanning it only once.
+        Files are stored as "<file_id>-<name>" or "<file_id><ext>".
+        """
+        index = self._files_index.get(files_dir)
+        if index is None:
+            index = {}
+            if os.path.exists(files_dir):
+                with os.scandir(files_dir) as entries:
+                    for entry in entries:
+                        file_id = entry.name.split('-', 1)[0].split('.', 1)[0]
+                        index.setdefault(file_id, entry.path)
+            self._files_index[files_dir] = index
+        return index
 
     def get_file_path(self, file_id: str, files_dir: str) -> str | None:
         """
-        Find a file path given a file ID by checking for any file that starts with that ID.
+        Find a file path given a file ID using the cached index of the files directory.
         Returns None if no matching file is found.
         """
-        if not os.path.exists(files_dir):
-            return None
-        
-        for filename in os.listdir(files_dir):
-            if filename.startswith(file_id):
-                return os.path.join(files_dir, filename)
-        return None
+        return self._get_files_index(files_dir).get(file_id)
+
+    def attachment_file_id(self, url: str, files_dir: str) -> str:
+        """
+        Derive a file ID from the URL of an attachment that has none.
+        Older versions named these files after the URL's MD5 digest, so that ID is
+        kept when such a file is already in the files directory.
+        """
+        url_bytes = url.encode('utf-8', 'replace')
+        file_id = hashlib.blake2b(url_bytes, digest_size=16).hexdigest()
+        
+        files_index = self._get_files_index(files_dir)
+        if files_index and file_id not in files_index:
+            legacy_id = hashlib.md5(url_bytes).hexdigest()
+            if legacy_id in files_index:
+                return legacy_id
+        return file_id
 
     def download_file(self, url: str, file_id: str, channel: str, original_name: str = None) -> tuple[str, bool]:
         """Download a file from Slack and return the local path and success status"""
@@ -154,10 +894,6 @@ class SlackExportViewer:
             return url, True
         
         try:
-            # Initialize channel's file tracking if needed
-            if channel not in self.channel_files:
-                self.channel_files[channel] = {}
-            
             # Determine filename and path FIRST
             if original_name:
                 name, ext = os.path.splitext(original_name)
@@ -169,73 +905,65 @@ class SlackExportViewer:
                 filename = f"{file_id}{ext}"
             
             # All files go in the files directory
-            local_path = os.path.join(self.output_dir, channel, 'files')
+            files_dir = self.channel_dirs(channel)[1]
             
             # Check if any file with this file_id prefix exists
-            existing_file = self.get_file_path(file_id, local_path)
+            existing_file = self.get_file_path(file_id, files_dir)
             if existing_file:
                 log('debug', 'Found existing file with ID {file_id}: {path}', 
                     file_id=file_id, path=existing_file)
-                self.channel_files[channel][file_id] = existing_file
+                with self._lock:
+                    self.channel_files.setdefault(channel, {})[file_id] = existing_file
                 return existing_file, True
             
             # If no existing file found, proceed with download
-            local_path = os.path.join(local_path, filename)
+            local_path = os.path.join(files_dir, filename)
             
             # If we get here, we need to download the file
             log('debug', 'Downloading file: {file_id} ({url}) -> {path}', 
                 file_id=file_id, url=url, path=local_path)
             os.makedirs(os.path.dirname(local_path), exist_ok=True)
             
-            # Add headers to mimic a browser request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Referer': 'https://www.google.com'
-            }
-            
             try:
-                # Create a Request object with headers
-                req = urllib.request.Request(url, headers=headers)
-                
                 # Try to download with a timeout
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    if response.status != 200:
-                        raise urllib.error.URLError(f"HTTP {response.status}: {response.reason}")
+                with self._session.get(url, timeout=10, stream=True) as response:
+                    response.raise_for_status()
                     
+                    response.raw.decode_content = True  # Undo any gzip transfer encoding
                     with open(local_path, 'wb') as out_file:
-                        shutil.copyfileobj(response, out_file)
+                        shutil.copyfileobj(response.raw, out_file, DOWNLOAD_CHUNK_SIZE)
                 
                 # Verify the file was actually created and has content
                 if not os.path.exists(local_path) or os.path.getsize(local_path) == 0:
                     raise Exception("File was not created or is empty")
                 
                 # Track this file
-                self.channel_files[channel][file_id] = local_path
+                with self._lock:
+                    self.channel_files.setdefault(channel, {})[file_id] = local_path
+                    self._get_files_index(files_dir)[file_id] = local_path
                 
                 log('debug', 'Successfully downloaded file: {file_id}', file_id=file_id)
                 return local_path, True
                 
-            except urllib.error.HTTPError as e:
+            except requests.exceptions.HTTPError as e:
                 log('error', 'HTTP error downloading {name} from {url}: {code} {reason}', 
                     name=original_name or file_id,
                     url=url,
-                    code=e.code,
-                    reason=e.reason)
+                    code=e.response.status_code,
+                    reason=e.response.reason)
                 return None, False
                 
-            except urllib.error.URLError as e:
-                log('error', 'URL error downloading {name} from {url}: {reason}', 
+            except requests.exceptions.Timeout:
+                log('error', 'Timeout downloading {name} from {url}', 
                     name=original_name or file_id,
-                    url=url,
-                    reason=str(e.reason))
+                    url=url)
                 return None, False
                 
-            except TimeoutError:
-                log('error', 'Timeout downloading {name} from {url}', 
+            except requests.exceptions.RequestException as e:
+                log('error', 'URL error downloading {name} from {url}: {reason}', 
                     name=original_name or file_id,
-                    url=url)
+                    url=url,
+                    reason=str(e))
                 return None, False
                 
         except Exception as e:
@@ -243,331 +971,165 @@ class SlackExportViewer:
                 name=original_name or file_id,
                 url=url, 
                 error=str(e))
-            self.failed_downloads.add(url)
+            with self._lock:
+                self.failed_downloads.add(url)
             return None, False
 
+    def queue_download(self, url: str, file_id: str, channel: str, original_name: str = None) -> tuple[Future, bool]:
+        """
+        Start a download on the thread pool, sharing it with earlier requests for the same file.
+        Returns the download and whether this request started it.
+        """
+        key = (channel, file_id)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = self._pool.submit(self.download_file, url, file_id, channel, original_name)
+            self._inflight[key] = future
+        return future, True
+
     def process_message(self, msg: Dict, channel: str) -> Dict:
         """Process a message and its files"""
-        processed_msg = msg.copy()
-        
-        # Initialize tracking for this channel if needed
-        if not hasattr(self, 'channel_missing_files'):
-            self.channel_missing_files = {}
-        if not hasattr(self, 'channel_downloaded_files'):
-            self.channel_downloaded_files = {}
-        
-        if channel not in self.channel_missing_files:
-            self.channel_missing_files[channel] = []
-        if channel not in self.channel_downloaded_files:
-            self.channel_downloaded_files[channel] = []
-        
         # Collect all files from both files and attachments
         all_files = []
         
         # Add regular files
-        if 'files' in processed_msg:
-            all_files.extend((file_info, False) for file_info in processed_msg['files'])
+        if 'files' in msg:
+            all_files.extend((file_info, False) for file_info in msg['files'])
         
         # Add files from attachments
-        if 'attachments' in processed_msg:
-            for attachment in processed_msg['attachments']:
+        if 'attachments' in msg:
+            for attachment in msg['attachments']:
                 if 'files' in attachment:
                     all_files.extend((file_info, True) for file_info in attachment['files'])
         
+        # Most messages have no files and are passed through without copying
+        if not all_files:
+            return msg
+        
         # Process all files uniformly
         processed_files = []
+        channel_root, files_dir = self.channel_dirs(channel)
         for file_info, is_attachment in all_files:
-            processed_file = file_info.copy()
+            extras = {}  # Fields added to the file's copy
             file_id = file_info.get('id', '')
             if not file_id and is_attachment:
                 # For attachments without ID, create one from URL
                 url = file_info.get('url_private', '')
-                file_id = hashlib.md5(url.encode()).hexdigest()
-                processed_file['id'] = file_id
+                file_id = self.attachment_file_id(url, files_dir)
+                extras['id'] = file_id
             
             mode = file_info.get('mode', '')
             name = file_info.get('name', 'Unnamed file')
             
             # Check if file exists in the files directory
-            files_dir = os.path.join(self.output_dir, channel, 'files')
             existing_path = self.get_file_path(file_id, files_dir)
             
             if existing_path:
                 # File exists locally
-                rel_path = os.path.relpath(existing_path, os.path.join(self.output_dir, channel))
-                processed_file['local_path'] = rel_path
-                processed_file['download_failed'] = False
-                self.channel_downloaded_files[channel].append({
-                    'timestamp': msg.get('ts', '0'),
-                    'file_id': file_id,
-                    'mode': 'exists'
-                })
-                processed_files.append(processed_file)
+                extras['local_path'] = self.channel_relpath(existing_path, channel_root)
+                extras['download_failed'] = False
+                self.channel_downloaded_files[channel].append(FileRec(msg.get('ts', '0'), file_id, 'exists'))
+                processed_files.append({**file_info, **extras})
                 continue
             
             # Handle missing or failed files
             url = file_info.get('url_private', '')
             if not url or mode in ['tombstone', 'hidden_by_limit']:
-                self.channel_missing_files[channel].append({
-                    'timestamp': msg.get('ts', '0'),
-                    'file_id': file_id,
-                    'mode': mode if mode else 'url_missing'
-                })
-                processed_file['download_failed'] = True
-                processed_file['local_path'] = None
-                processed_file['failure_reason'] = f'File {mode if mode else "URL missing"}'
-                processed_files.append(processed_file)
+                self.channel_missing_files[channel].append(FileRec(msg.get('ts', '0'), file_id, mode if mode else 'url_missing'))
+                extras['download_failed'] = True
+                extras['local_path'] = None
+                extras['failure_reason'] = f'File {mode if mode else "URL missing"}'
+                processed_files.append({**file_info, **extras})
                 continue
             
-            # Try to download the file
-            local_path, success = self.download_file(url, file_id, channel, name)
+            # Queue the download; finish_downloads fills in the result. Only the reference
+            # that started it counts as downloaded, later ones find the file already there
+            processed_file = {**file_info, **extras}
+            future, started = self.queue_download(url, file_id, channel, name)
+            self.channel_pending_downloads.setdefault(channel, []).append(
+                (processed_file, future, msg.get('ts', '0'), file_id, 'downloaded' if started else 'exists'))
+            processed_files.append(processed_file)
+        
+        # Copy the message only now that its files have changed
+        return {**msg, 'files': processed_files}
+
+    def channel_dirs(self, channel: str) -> tuple[str, str]:
+        """Return a channel's output directory and its files directory, joined once per channel"""
+        dirs = self._channel_dirs.get(channel)
+        if dirs is None:
+            channel_root = os.path.join(self.output_dir, channel)
+            dirs = self._channel_dirs[channel] = (channel_root, os.path.join(channel_root, 'files'))
+        return dirs
+
+    def channel_relpath(self, path: str, channel_root: str) -> str:
+        """Get a path relative to its channel output directory"""
+        # Files are always created under the channel root, so slicing off the
+        # prefix avoids os.path.relpath splitting and rejoining both paths
+        prefix = channel_root + os.sep
+        if path.startswith(prefix):
+            return path[len(prefix):]
+        return os.path.relpath(path, channel_root)
+
+    def finish_downloads(self, channel: str) -> None:
+        """Wait for a channel's queued downloads and record their results"""
+        channel_root = self.channel_dirs(channel)[0]
+        for processed_file, future, timestamp, file_id, mode in self.channel_pending_downloads.pop(channel, []):
+            local_path, success = future.result()
             
             if success and local_path:
-                self.channel_downloaded_files[channel].append({
-                    'timestamp': msg.get('ts', '0'),
-                    'file_id': file_id,
-                    'mode': 'downloaded'
-                })
-                rel_path = os.path.relpath(local_path, os.path.join(self.output_dir, channel))
+                self.channel_downloaded_files[channel].append(FileRec(timestamp, file_id, mode))
+                rel_path = self.channel_relpath(local_path, channel_root)
                 processed_file['local_path'] = rel_path
                 processed_file['download_failed'] = False
             else:
-                self.channel_missing_files[channel].append({
-                    'timestamp': msg.get('ts', '0'),
-                    'file_id': file_id,
-                    'mode': 'download_failed'
-                })
+                self.channel_missing_files[channel].append(FileRec(timestamp, file_id, 'download_failed'))
                 processed_file['download_failed'] = True
                 processed_file['local_path'] = None
                 processed_file['failure_reason'] = 'Download failed'
-            
-            processed_files.append(processed_file)
-        
-        # Update message with processed files
-        if processed_files:
-            processed_msg['files'] = processed_files
-        
-        return processed_msg
 
     def process_blocks(self, blocks: List[Dict]) -> str:
         """Process Slack blocks into HTML"""
-        output = ""
+        parts = []
         for block in blocks:
             if block['type'] == 'rich_text':
                 for element in block['elements']:
                     if element['type'] == 'rich_text_section':
                         for item in element['elements']:
-                            if item['type'] == 'text':
-                                output += html.escape(item['text'])
-                            elif item['type'] == 'link':
-                                # Escape the text but not the URL
-                                text = html.escape(item.get("text", item["url"]))
-                                url = item["url"]  # URLs should not be escaped
-                                output += f'<a href="{url}">{text}</a>'
-                            elif item['type'] == 'emoji':
-                                output += f':{item["name"]}:'
-        return output
-
-    def generate_channel_page(self, channel: str, messages: List[Dict]) -> str:
-        """Generate HTML for a channel's messages"""
-        # Group messages by thread first to get counts
-        threads = {}  # thread_ts -> list of messages
+                            render = _RICH_TEXT_RENDERERS.get(item['type'])
+                            if render:
+                                parts.append(render(item))
+        return ''.join(parts)
+
+    def generate_channel_page(self, channel: str, messages: List[Dict]) -> Iterator[bytes]:
+        """Generate HTML for a channel's messages, yielded in UTF-8 encoded chunks"""
+        # Group thread replies by their parent in a single pass
+        thread_replies = {}  # thread_ts -> list of replies
         for msg in messages:
             thread_ts = msg.get('thread_ts')
-            if thread_ts:
-                if thread_ts not in threads:
-                    threads[thread_ts] = []
-                threads[thread_ts].append(msg)
+            if thread_ts and thread_ts != msg['ts']:
+                thread_replies.setdefault(thread_ts, []).append(msg)
         
         # Count actual threads (ones with replies)
-        thread_count = sum(1 for ts, msgs in threads.items() 
-                         if any(m['ts'] != ts for m in msgs))
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Slack Export - #{channel}</title>
-            <style>
-                body {{ 
-                    font-family: Arial, sans-serif; 
-                    margin: 20px; 
-                }}
-                .message {{ 
-                    margin: 10px 0; 
-                    padding: 10px; 
-                    border-bottom: 1px solid #eee; 
-                }}
-                .timestamp {{ 
-                    color: #666; 
-                    font-size: 0.8em; 
-                }}
-                .user {{ 
-                    font-weight: bold; 
-                    color: #1264A3; 
-                }}
-                .attachment {{ 
-                    margin: 10px 0; 
-                }}
-                .attachment img {{ 
-                    max-width: 400px; 
-                }}
-                .failed-download {{ 
-                    color: #666;
-                    font-style: italic;
-                }}
-                nav {{ 
-                    margin-bottom: 20px; 
-                }}
-                .thumbnail {{
-                    max-width: 200px;
-                    max-height: 200px;
-                    object-fit: contain;
-                    cursor: pointer;
-                }}
-                .thumbnail-link {{
-                    display: inline-block;
-                    text-decoration: none;
-                }}
-                .thread-toggle {{
-                    color: #1264A3;
-                    text-decoration: none;
-                    font-size: 0.9em;
-                    margin-top: 5px;
-                    cursor: pointer;
-                }}
-                .thread-toggle:hover {{
-                    text-decoration: underline;
-                }}
-                .thread-container {{
-                    margin-left: 20px;
-                    border-left: 2px solid #eee;
-                    padding-left: 10px;
-                    display: none;
-                }}
-                .thread-container.expanded {{
-                    display: block;
-                }}
-                .thread-controls {{
-                    margin-bottom: 20px;
-                    padding: 10px;
-                    background: #f8f8f8;
-                    border-radius: 5px;
-                }}
-                .thread-controls a {{
-                    color: #1264A3;
-                    text-decoration: none;
-                    margin-right: 20px;
-                    cursor: pointer;
-                }}
-                .thread-controls a:hover {{
-                    text-decoration: underline;
-                }}
-                .reply-count {{
-                    color: #666;
-                    font-size: 0.9em;
-                }}
-                .file {{
-                    margin: 10px 0;
-                }}
-                
-                .image-container {{
-                    margin: 10px 0;
-                    max-width: 800px;
-                }}
-                
-                .message-image {{
-                    max-width: 100%;
-                    height: auto;
-                    border-radius: 4px;
-                    display: block;
-                    margin-bottom: 8px;
-                }}
-                
-                .image-caption {{
-                    font-size: 0.9em;
-                    color: #666;
-                }}
-                
-                .image-caption a {{
-                    color: #1264A3;
-                    text-decoration: none;
-                }}
-                
-                .image-caption a:hover {{
-                    text-decoration: underline;
-                }}
-                
-                .file-link {{
-                    margin: 5px 0;
-                }}
-                
-                .file-link a {{
-                    color: #1264A3;
-                    text-decoration: none;
-                    display: inline-flex;
-                    align-items: center;
-                    padding: 6px 12px;
-                    background: #f8f9fa;
-                    border-radius: 4px;
-                }}
-                
-                .file-link a:hover {{
-                    background: #e9ecef;
-                    text-decoration: none;
-                }}
-                
-                .text {{
-                    white-space: pre-line;  /* Preserve line breaks but not spaces */
-                    word-wrap: break-word;  /* Break long words */
-                    margin: 8px 0;
-                }}
-            </style>
-            <script>
-                function toggleThread(threadId) {{
-                    const container = document.getElementById('thread-' + threadId);
-                    container.classList.toggle('expanded');
-                    
-                    const toggle = document.getElementById('toggle-' + threadId);
-                    const replies = toggle.getAttribute('data-replies');
-                    if (container.classList.contains('expanded')) {{
-                        toggle.textContent = 'Hide thread (' + replies + ' replies) ↑';
-                    }} else {{
-                        toggle.textContent = 'Show thread (' + replies + ' replies) ↓';
-                    }}
-                }}
-                
-                function expandAllThreads() {{
-                    document.querySelectorAll('.thread-container').forEach(container => {{
-                        container.classList.add('expanded');
-                    }});
-                    document.querySelectorAll('.thread-toggle').forEach(toggle => {{
-                        const replies = toggle.getAttribute('data-replies');
-                        toggle.textContent = 'Hide thread (' + replies + ' replies) ↑';
-                    }});
-                }}
-                
-                function collapseAllThreads() {{
-                    document.querySelectorAll('.thread-container').forEach(container => {{
-                        container.classList.remove('expanded');
-                    }});
-                    document.querySelectorAll('.thread-toggle').forEach(toggle => {{
-                        const replies = toggle.getAttribute('data-replies');
-                        toggle.textContent = 'Show thread (' + replies + ' replies) ↓';
-                    }});
-                }}
-            </script>
-        </head>
-        <body>
-            <nav>
-                <a href="../index.html">← Back to Channels</a>
-            </nav>
-            <h1>#{channel}</h1>
-            <div class="thread-controls">
-                <a onclick="expandAllThreads()">Expand all {thread_count} threads</a>
-                <a onclick="collapseAllThreads()">Collapse all {thread_count} threads</a>
-            </div>
-        """
+        thread_count = len(thread_replies)
+        
+        yield f"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Slack Export - #{channel}</title>""".encode('utf-8')
+        yield _CHANNEL_PAGE_HEAD
+        yield f"""</head>
+<body>
+    <nav>
+        <a href="../index.html">← Back to Channels</a>
+    </nav>
+    <h1>#{channel}</h1>
+    <div class="thread-controls">
+        <a onclick="expandAllThreads()">Expand all {thread_count} threads</a>
+        <a onclick="collapseAllThreads()">Collapse all {thread_count} threads</a>
+    </div>
+""".encode('utf-8')
         
         # Output messages with inline threads
         for msg in messages:
@@ -575,102 +1137,108 @@ class SlackExportViewer:
             if msg.get('thread_ts') and msg['thread_ts'] != msg['ts']:
                 continue
                 
-            html += self.format_message(msg)
+            yield self.format_message(msg).encode('utf-8')
             
             # If this message has replies, add the thread container
             thread_ts = msg['ts']
-            if thread_ts in threads:
-                thread_messages = sorted(threads[thread_ts], key=lambda x: float(x['ts']))
-                reply_count = sum(1 for m in thread_messages if m['ts'] != thread_ts)
-                if reply_count > 0:  # Only show thread UI if there are actual replies
-                    html += f"""
+            replies = thread_replies.get(thread_ts)
+            if replies:  # Only show thread UI if there are actual replies
+                replies.sort(key=_msg_ts)
+                reply_count = len(replies)
+                yield f"""
                     <div>
                         <a class="thread-toggle" id="toggle-{thread_ts}" 
                            onclick="toggleThread('{thread_ts}')"
                            data-replies="{reply_count}">Show thread ({reply_count} replies) ↓</a>
                         <div class="thread-container" id="thread-{thread_ts}">
-                    """
-                    for thread_msg in thread_messages:
-                        if thread_msg['ts'] != thread_ts:  # Skip parent message, already shown
-                            html += self.format_message(thread_msg)
-                    html += "</div></div>"
-        
-        html += """
-        </body>
-        </html>
+                    """.encode('utf-8')
+                for reply in replies:
+                    yield self.format_message(reply).encode('utf-8')
+                yield b"</div></div>"
+        
+        yield _CHANNEL_PAGE_FOOT
+
+    def _iter_message_files(self, channel_path: str) -> Iterator[tuple[str, List[Dict]]]:
+        """Yield (filename, messages) for each .json file in a channel directory, in name order"""
+        for filename, _ in sorted(self.list_data_dir(channel_path)):
+            if not filename.endswith('.json'):
+                continue
+            
+            try:
+                messages = _loads(self.read_data(posixpath.join(channel_path, filename)))
+            except Exception as e:
+                log('error', f"Error processing {filename}: {e}")
+                continue
+            
+            yield filename, messages
+
+    def _scan_channel(self, channel: str) -> ChannelScan | None:
+        """
+        Read a channel's message files once and gather everything the index page needs.
+        Returns None if the channel has no data in the export.
         """
-        return html
+        channel_path = self.get_data_path(f'export_data/{channel}')
+        if not self.data_exists(channel_path):
+            return None
+        
+        scan = ChannelScan()
+        for filename, messages in self._iter_message_files(channel_path):
+            scan.add_file(filename, messages)
+        return scan
+
+    def scan_channel(self, channel: str) -> ChannelScan | None:
+        """Return the channel's scan totals, reading its message files on first use"""
+        if channel not in self._channel_scans:
+            self._channel_scans[channel] = self._scan_channel(channel)
+        return self._channel_scans[channel]
+
+    def add_channel_scan(self, channel: str, scan: ChannelScan | None) -> None:
+        """Reuse scan totals gathered elsewhere (e.g. in a worker process) for a channel"""
+        self._channel_scans[channel] = scan
+
+    def release_channel(self, channel: str) -> None:
+        """Drop the state kept for a finished channel other than its scan totals and reports"""
+        _, files_dir = self._channel_dirs.pop(channel, (None, None))
+        self._files_index.pop(files_dir, None)
+        self.channel_files.pop(channel, None)
+        with self._lock:
+            for key in [key for key in self._inflight if key[0] == channel]:
+                del self._inflight[key]
 
     def get_channel_user_stats(self, channel: str) -> List[tuple[str, int]]:
         """Get list of users and their message counts for a channel"""
-        user_counts = {}  # user_id -> message count
-        
         channel_path = self.get_data_path(f'export_data/{channel}')
-        if not os.path.exists(channel_path):
+        if not self.data_exists(channel_path):
             return []
         
-        # Load users.json from the channel directory or parent directory
-        users_file = os.path.join(os.path.dirname(channel_path), 'users.json')
-        if not os.path.exists(users_file):
-            users_file = os.path.join(channel_path, 'users.json')
-        
-        if os.path.exists(users_file):
-            try:
-                with open(users_file, 'r') as f:
-                    users = json.load(f)
-                    self.users_data = {u['id']: u for u in users}
-            except Exception as e:
-                log('error', f"Failed to load users file for channel stats: {e}")
-        
-        for filename in os.listdir(channel_path):
-            if not filename.endswith('.json'):
-                continue
+        # Load users.json from the channel directory or parent directory,
+        # unless load_users (or an earlier call) already loaded it
+        if not self.users_data:
+            users_file = posixpath.join(posixpath.dirname(channel_path), 'users.json')
+            if not self.data_exists(users_file):
+                users_file = posixpath.join(channel_path, 'users.json')
             
-            with open(os.path.join(channel_path, filename)) as f:
+            if self.data_exists(users_file):
                 try:
-                    day_messages = json.load(f)
-                    for msg in day_messages:
-                        user_id = msg.get('user')
-                        if user_id:
-                            user_counts[user_id] = user_counts.get(user_id, 0) + 1
+                    users = _loads(self.read_data(users_file))
+                    self.users_data = {u['id']: u for u in users}
+                    self.build_username_cache()
                 except Exception as e:
-                    log('error', f"Error processing {filename}: {e}")
-                    continue
+                    log('error', f"Failed to load users file for channel stats: {e}")
         
         # Convert to list of (username, count) tuples, sorted by count
         user_stats = [(self.get_username(uid), count) 
-                      for uid, count in user_counts.items()]
+                      for uid, count in self.scan_channel(channel).user_counts.items()]
         return sorted(user_stats, key=lambda x: x[1], reverse=True)
 
     def get_channel_activity_map(self, channel: str, days: int = 30) -> Dict[str, int]:
         """Get daily message counts for the last N days"""
-        activity = {}
-        channel_path = self.get_data_path(f'export_data/{channel}')
-        
-        if not os.path.exists(channel_path):
+        scan = self.scan_channel(channel)
+        if not scan:
             return {}
         
-        # Get all dates from json files and count messages by month
-        monthly_counts = {}
-        for filename in os.listdir(channel_path):
-            if not filename.endswith('.json'):
-                continue
-            
-            # Extract date from filename (assuming YYYY-MM-DD.json format)
-            date = filename.replace('.json', '')
-            if not date[0].isdigit():  # Skip non-date files
-                continue
-            
-            try:
-                date_obj = datetime.strptime(date, '%Y-%m-%d')
-                month_key = date_obj.strftime('%Y-%m')
-                
-                with open(os.path.join(channel_path, filename)) as f:
-                    messages = json.load(f)
-                    monthly_counts[month_key] = monthly_counts.get(month_key, 0) + len(messages)
-            except ValueError:
-                continue
-        
+        # Messages per month, counted from the day files
+        monthly_counts = scan.monthly_counts
         if not monthly_counts:
             return {}
         
@@ -681,283 +1249,164 @@ class SlackExportViewer:
         
         return {
             'activity': monthly_counts,
-            'start_date': datetime.strptime(start_month, '%Y-%m'),
-            'end_date': datetime.strptime(end_month, '%Y-%m')
+            'start_date': datetime(int(start_month[:4]), int(start_month[5:7]), 1),
+            'end_date': datetime(int(end_month[:4]), int(end_month[5:7]), 1)
         }
 
     def get_export_info(self) -> Dict[str, str]:
-        """Get workspace name and export date info"""
+        """
+        Get workspace name and export date info.
+        The export doesn't change during a run, so this is only worked out once.
+        """
+        if self._export_info is not None:
+            return self._export_info
+        
         info = {
             'workspace': 'Unknown Workspace',
             'workspace_url': None,
             'date_range': None  # Initialize as None to detect if we need to find it
         }
         
-        # Try to get workspace URL from canvases.json if available
-        canvases_file = self.get_data_path('export_data/canvases.json')
-        if os.path.exists(canvases_file):
-            try:
-                with open(canvases_file) as f:
-                    data = json.load(f)
-                    if data and isinstance(data, list):
-                        for canvas in data:
-                            url = canvas.get('url', '')
-                            if url and 'slack.com' in url:
-                                # Extract workspace URL from canvas URL
-                                # e.g., https://app.slack.com/canvas/TEAM123 -> https://TEAM123.slack.com
-                                team_id = url.split('/')[-1]
-                                info['workspace_url'] = f"https://{team_id}.slack.com"
-                                break
-            except:
-                pass
-        
-        if self.zip_path:
-            # Try to extract info from zip filename first
-            zip_name = os.path.basename(self.zip_path)
-            zip_name = zip_name.replace('.zip', '')
-            
-            if 'export' in zip_name.lower():
-                parts = zip_name.split('export', 1)
-                if parts:
-                    info['workspace'] = parts[0].strip()
-                    if len(parts) > 1:
-                        info['date_range'] = parts[1].strip()
-        
-        # Try to get workspace name from channels.json if available
-        channels_file = self.get_data_path('export_data/channels.json')
-        if os.path.exists(channels_file):
-            try:
-                with open(channels_file) as f:
-                    data = json.load(f)
-                    if data and isinstance(data, list) and data[0].get('is_org_shared') is not None:
-                        workspace = data[0].get('name', '').split('-')[0]
-                        if workspace:
-                            info['workspace'] = workspace
-            except:
-                pass
-        
-        # If date_range is still None, determine it from the channel data
-        if not info['date_range']:
-            earliest_date = None
-            latest_date = None
-            
-            # Look through all channel directories
-            export_dir = self.get_data_path('export_data')
-            if os.path.exists(export_dir):
-                for item in os.listdir(export_dir):
-                    channel_path = os.path.join(export_dir, item)
-                    if os.path.isdir(channel_path):
-                        for filename in os.listdir(channel_path):
-                            if filename.endswith('.json') and filename[0].isdigit():
-                                try:
-                                    date_str = filename.replace('.json', '')
-                                    date = datetime.strptime(date_str, '%Y-%m-%d')
-                                    if not earliest_date or date < earliest_date:
-                                        earliest_date = date
-                                    if not latest_date or date > latest_date:
-                                        latest_date = date
-                                except ValueError:
-                                    continue
-            
-            if earliest_date and latest_date:
-                if earliest_date.year == latest_date.year:
-                    if earliest_date.month == latest_date.month:
-                        info['date_range'] = f"{earliest_date.strftime('%B %Y')}"
-                    else:
-                        info['date_range'] = f"{earliest_date.strftime('%B')} - {latest_date.strftime('%B %Y')}"
-                else:
-                    info['date_range'] = f"{earliest_date.strftime('%B %Y')} - {latest_date.strftime('%B %Y')}"
-        
-        return info
-
-    def generate_index_page(self, channels: List[str]) -> str:
-        """Generate main index page with channel list"""
-        export_info = self.get_export_info()
-        
-        # Get channel data for sorting
-        channel_data = []
-        
-        # Find global start and end dates across all channels
-        global_start = None
-        global_end = None
-        
-        for channel in channels:
-            stats = self.get_channel_stats(channel)
-            activity_data = self.get_channel_activity_map(channel)
-            
-            if activity_data:
-                start_date = activity_data.get('start_date')
-                end_date = activity_data.get('end_date')
-                if start_date:
-                    if not global_start or start_date < global_start:
-                        global_start = start_date
-                if end_date:
-                    if not global_end or end_date > global_end:
-                        global_end = end_date
-            
-            # Calculate metrics for sorting
-            recent_activity = None
-            total_messages = stats['messages']
-            
-            if activity_data and activity_data.get('activity'):
-                # Get most recent month with activity
-                active_months = sorted(activity_data['activity'].keys())
-                if active_months:
-                    recent_activity = active_months[-1]
-            
-            # Calculate message count from stats instead of trying to parse activity text
-            message_count = stats['messages']
-            last_message = ""
-            
-            # Get most recent message timestamp
-            if activity_data and activity_data.get('activity'):
-                active_months = sorted(activity_data['activity'].keys())
-                if active_months:
-                    last_message = active_months[-1]  # Format is already YYYY-MM
-            
-            channel_data.append({
-                'name': channel,
-                'stats': stats,
-                'recent_activity': recent_activity,
-                'total_messages': total_messages,
-                'user_stats': self.get_channel_user_stats(channel),
-                'activity_data': activity_data,
-                'message_count': message_count,
-                'last_message': last_message
-            })
-        
-        # Calculate activity graph width based on time interval
-        months_width = 200  # Default minimum width
-        if global_start and global_end:
-            # Calculate number of months between start and end
-            months_between = ((global_end.year - global_start.year) * 12 + 
-                             global_end.month - global_start.month + 1)
-            # Use 15px per month as minimum bar width
-            calculated_width = max(200, months_between * 15)
-            months_width = min(calculated_width, 400)  # Cap at 400px
-        
-        # Add debug logging
-        log('debug', 'Generating index.html header')
-        
-        html = """<!DOCTYPE html>
-<html>
-<head>
-    <title>Slack Export</title>
-    <style>
-        body { 
-            font-family: Arial, sans-serif; 
-            margin: 0 auto;
-            padding: 20px;
-            max-width: 1200px;
-            background: #f5f5f5;
-        }
-        #channels-container {
-            list-style: none;
-            padding: 0;
-        }
-        .channel-item { 
-            margin: 15px 0; 
-            padding: 20px;
-            border-radius: 8px;
-            background: white;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            display: flex;  /* Make it a flex container */
-            align-items: flex-start;  /* Align items to top */
-            gap: 20px;     /* Space between content and graph */
-        }
-        .channel-name { 
-            font-size: 1.2em;
-            font-weight: bold;
-            color: #1264A3;
-            text-decoration: none;
-        }
-        .channel-name:hover {
-            text-decoration: underline;
-        }
-        .channel-stats { 
-            color: #666;
-            margin-left: 10px;
-            font-size: 0.9em;
-        }
-        .channel-content {
-            flex: 1;       /* Take up remaining space */
-            min-width: 0;  /* Allow content to shrink */
-        }
-        .channel-main {
-            margin-bottom: 10px;
-        }
-        .activity-container {
-            width: 300px;  /* Fixed width for the graph */
-            flex-shrink: 0; /* Don't shrink the graph */
-        }
-        .activity-graph { 
-            display: flex;
-            align-items: flex-end;
-            height: 40px;
-            gap: 1px;
-        }
-        .activity-bar {
-            flex: 1;
-            background-color: #1264A3;
-            opacity: 0.7;
-            transition: height 0.2s ease;
-        }
-        .activity-bar:hover {
-            opacity: 1;
-        }
-        .details {
-            display: none;  /* Hidden by default */
-            margin: 10px 0;
-            padding: 15px;
-            background: #f8f9fa;
-            border-radius: 6px;
-            font-size: 0.9em;
-        }
-        .details.show {
-            display: block;  /* Show when .show class is added */
-        }
-        .details-toggle {
-            color: #1264A3;
-            cursor: pointer;
-            font-size: 0.9em;
-            text-decoration: none;
-            padding: 4px 8px;
-            border-radius: 4px;
-            background: #f0f0f0;
-            margin-left: 10px;
-        }
-        .details-toggle:hover {
-            background: #e0e0e0;
-        }
-        .global-controls {
-            margin: 10px 0 20px 0;
-        }
-        .global-controls a {
-            color: #1264A3;
-            text-decoration: none;
-            margin-right: 20px;
-            cursor: pointer;
-        }
-        .global-controls a:hover {
-            text-decoration: underline;
-        }
-    </style>
-</head>
-<body>
-    <h1>Slack Export</h1>
-    
-    <div class="global-controls">
-        <a onclick="expandAllDetails()">Expand All Details</a>
-        <a onclick="collapseAllDetails()">Collapse All Details</a>
-    </div>
-    
-    <div class="sort-buttons">
-        <button id="sort-alpha">Sort Alphabetically</button>
-        <button id="sort-recent">Sort by Recently Active</button>
-        <button id="sort-active">Sort by Most Active</button>
-    </div>
-    
-    <div id="channels-container">"""
+        # Try to get workspace URL from canvases.json if available
+        canvases_file = self.get_data_path('export_data/canvases.json')
+        if self.data_exists(canvases_file):
+            try:
+                data = _loads(self.read_data(canvases_file))
+                if data and isinstance(data, list):
+                    for canvas in data:
+                        url = canvas.get('url', '')
+                        if url and 'slack.com' in url:
+                            # Extract workspace URL from canvas URL
+                            # e.g., https://app.slack.com/canvas/TEAM123 -> https://TEAM123.slack.com
+                            team_id = url.split('/')[-1]
+                            info['workspace_url'] = f"https://{team_id}.slack.com"
+                            break
+            except:
+                pass
+        
+        if self.zip_path:
+            # Try to extract info from zip filename first
+            zip_name = os.path.basename(self.zip_path)
+            zip_name = zip_name.replace('.zip', '')
+            
+            if 'export' in zip_name.lower():
+                parts = zip_name.split('export', 1)
+                if parts:
+                    info['workspace'] = parts[0].strip()
+                    if len(parts) > 1:
+                        info['date_range'] = parts[1].strip()
+        
+        # Try to get workspace name from channels.json if available, reusing it if already loaded
+        channels_file = self.get_data_path('export_data/channels.json')
+        if self.channels_data or self.data_exists(channels_file):
+            try:
+                if self.channels_data:
+                    data = list(self.channels_data.values())
+                else:
+                    data = _loads(self.read_data(channels_file))
+                if data and isinstance(data, list) and data[0].get('is_org_shared') is not None:
+                    workspace = data[0].get('name', '').split('-')[0]
+                    if workspace:
+                        info['workspace'] = workspace
+            except:
+                pass
+        
+        # If date_range is still None, determine it from the channel data
+        if not info['date_range']:
+            earliest_date = None
+            latest_date = None
+            
+            # Look through all channel directories
+            export_dir = self.get_data_path('export_data')
+            if self.data_exists(export_dir):
+                for item, is_dir in self.list_data_dir(export_dir):
+                    channel_path = posixpath.join(export_dir, item)
+                    if is_dir:
+                        for filename, _ in self.list_data_dir(channel_path):
+                            if not _DAY_FILE_RE.match(filename):
+                                continue
+                            try:
+                                date = datetime(int(filename[:4]), int(filename[5:7]), int(filename[8:10]))
+                            except ValueError:
+                                continue  # e.g. 2024-02-30.json
+                            if not earliest_date or date < earliest_date:
+                                earliest_date = date
+                            if not latest_date or date > latest_date:
+                                latest_date = date
+            
+            if earliest_date and latest_date:
+                info['date_range'] = _format_month_range(earliest_date, latest_date)
+        
+        self._export_info = info
+        return info
+
+    def generate_index_page(self, channels: List[str]) -> str:
+        """Generate main index page with channel list"""
+        export_info = self.get_export_info()
+        
+        # Get channel data for sorting
+        channel_data = []
+        
+        # Find global start and end dates across all channels
+        global_start = None
+        global_end = None
+        
+        for channel in channels:
+            stats = self.get_channel_stats(channel)
+            activity_data = self.get_channel_activity_map(channel)
+            
+            if activity_data:
+                start_date = activity_data.get('start_date')
+                end_date = activity_data.get('end_date')
+                if start_date:
+                    if not global_start or start_date < global_start:
+                        global_start = start_date
+                if end_date:
+                    if not global_end or end_date > global_end:
+                        global_end = end_date
+            
+            # Calculate metrics for sorting
+            total_messages = stats['messages']
+            
+            # Most recent month with activity (YYYY-MM keys compare chronologically)
+            recent_activity = None
+            if activity_data:
+                recent_activity = max(activity_data.get('activity', ()), default=None)
+            
+            # Calculate message count from stats instead of trying to parse activity text
+            message_count = stats['messages']
+            last_message = recent_activity or ""
+            
+            channel_data.append({
+                'name': channel,
+                'stats': stats,
+                'recent_activity': recent_activity,
+                'total_messages': total_messages,
+                'user_stats': self.get_channel_user_stats(channel),
+                'activity_data': activity_data,
+                'message_count': message_count,
+                'last_message': last_message
+            })
+        
+        # Calculate activity graph width based on time interval
+        months_width = 200  # Default minimum width
+        month_keys = []  # 'YYYY-MM' for every month from global start to end, shared by all graphs
+        if global_start and global_end:
+            # Calculate number of months between start and end
+            months_between = ((global_end.year - global_start.year) * 12 + 
+                             global_end.month - global_start.month + 1)
+            # Use 15px per month as minimum bar width
+            calculated_width = max(200, months_between * 15)
+            months_width = min(calculated_width, 400)  # Cap at 400px
+            
+            for i in range(months_between):
+                years, month_index = divmod(global_start.month - 1 + i, 12)
+                month_keys.append(f"{global_start.year + years:04d}-{month_index + 1:02d}")
+        
+        # Add debug logging
+        log('debug', 'Generating index.html header')
+        
+        parts = [_INDEX_HEAD]
 
         log('debug', 'Generating channel entries')
         
@@ -985,179 +1434,109 @@ class SlackExportViewer:
             else:
                 max_users = 2
             
-            user_display = []
-            for username, count in user_stats[:max_users]:
-                user_display.append(f"{username} ({count})")
+            user_display = [f"{username} ({count})" for username, count in user_stats[:max_users]]
             if len(user_stats) > max_users:
                 remaining = len(user_stats) - max_users
                 user_display.append(f"+{remaining} more")
             return ", ".join(user_display)
         
+        # Busiest month across all channels, used to scale every activity bar
+        global_max = max((count
+                          for data in channel_data
+                          if data['activity_data'] and data['activity_data']['activity']
+                          for count in data['activity_data']['activity'].values()),
+                         default=0)
+        
         for data in channel_data:
             channel = data['name']
             stats = data['stats']
-            user_stats = data['user_stats']
             activity_data = data['activity_data']
             
+            # Escape names once; they are interpolated into the page several times
+            channel_esc = _escape_html(channel)
+            user_stats = [(_escape_html(username), count) for username, count in data['user_stats']]
+            
             # Get channel summary from summary.txt if it exists
-            summary = "No summary has been generated yet. Use -ai feature to fix this."
-            summary_path = os.path.join(self.output_dir, channel, 'summary.txt')
-            if os.path.exists(summary_path):
-                try:
-                    with open(summary_path, 'r', encoding='utf-8') as f:
-                        summary = f.read().strip()
-                except Exception as e:
-                    log('error', f"Failed to read summary for {channel}: {e}")
+            summary = self.get_channel_summary(channel)
+            if summary is None:
+                summary = "No summary has been generated yet. Use -ai feature to fix this."
+            summary_esc = _escape_html(summary)
             
             # Format user list with all users
-            full_user_list = []
-            for username, count in user_stats:
-                full_user_list.append(f"{username} ({count})")
+            full_user_list = [f"{username} ({count})" for username, count in user_stats]
             user_list_html = "<br>".join(full_user_list) if full_user_list else "No messages"
             
             # Format user list with responsive width
             user_text = format_user_list(user_stats, 1200)  # Default to 1200px width
             
             # Generate activity graph
-            activity_html = '<div class="activity-container">'
-            activity_html += '<div class="activity-graph-wrapper">'
-            activity_html += '<div class="activity-graph">'
-            
-            # Calculate number of months between global start and end
-            if global_start and global_end:
-                current = global_start
-                while current <= global_end:
-                    month_key = current.strftime('%Y-%m')
-                    count = 0
-                    if activity_data and activity_data['activity']:
-                        count = activity_data['activity'].get(month_key, 0)
-                        max_msgs = max((data['activity_data']['activity'].values() 
-                                    for data in channel_data 
-                                    if data['activity_data'] and data['activity_data']['activity']),
-                                    key=lambda x: max(x) if x else 0)
-                        max_msgs = max(max_msgs) if max_msgs else 0
-                        height = int((count / max_msgs * 100) if max_msgs > 0 else 0)
-                    else:
-                        height = 0
-                    
-                    activity_html += f'<div class="activity-bar" style="height: {height}%" title="{month_key}: {count} messages"></div>'
-                    current = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+            activity_parts = ['<div class="activity-container">'
+                              '<div class="activity-graph-wrapper">'
+                              '<div class="activity-graph">']
             
-            activity_html += '</div></div></div>'
+            # One bar per month between global start and end
+            for month_key in month_keys:
+                count = 0
+                if activity_data and activity_data['activity']:
+                    count = activity_data['activity'].get(month_key, 0)
+                    height = int((count / global_max * 100) if global_max > 0 else 0)
+                else:
+                    height = 0
+                
+                activity_parts.append(f'<div class="activity-bar" style="height: {height}%" title="{month_key}: {count} messages"></div>')
             
-            # Add data attributes for sorting
-            recent_activity_attr = f' data-recent-activity="{data["recent_activity"]}"' if data["recent_activity"] else ''
-            message_count_attr = f' data-message-count="{data["total_messages"]}"'
+            activity_parts.append('</div></div></div>')
+            activity_html = ''.join(activity_parts)
             
-            html += f"""
-            <li class="channel-item" 
-                data-name="{channel}"
-                data-recent-activity="{data['recent_activity'] or ''}"
-                data-message-count="{data['message_count']}">
-                <div class="channel-content">
-                    <div class="channel-main">
-                        <a href="{channel}/index.html" class="channel-name">#{channel}</a>
-                        <span class="channel-stats">
-                            {stats['messages']} messages • 
-                            {stats['threads']} threads • 
-                            {stats['attachments']} files
-                            {f" • {stats['date_range']}" if stats['date_range'] else ""}
-                        </span>
-                        <a class="details-toggle" id="toggle-details-{channel}" 
-                           onclick="toggleDetails('{channel}')">Show Details ↓</a>
-                    </div>
-                    <div class="details" id="details-{channel}">
-                        <strong>Users:</strong><br>
-                        {user_list_html}<br><br>
-                        <strong>Summary:</strong><br>
-                        {summary}
-                    </div>
-                    <span class="user-list">{user_text}</span>
-                </div>
-                {activity_html}
-            </li>
-            """
+            parts.append(_INDEX_CHANNEL_ITEM.substitute(
+                name=channel_esc,
+                recent_activity=data['recent_activity'] or '',
+                message_count=data['message_count'],
+                messages=stats['messages'],
+                threads=stats['threads'],
+                attachments=stats['attachments'],
+                date_range=f" • {stats['date_range']}" if stats['date_range'] else "",
+                user_list=user_list_html,
+                summary=summary_esc,
+                user_text=user_text,
+                activity=activity_html,
+            ))
+        
+        parts.append(_INDEX_TAIL)
         
-        html += """
-        </div>
-        <script>
-            function expandAllDetails() {
-                document.querySelectorAll('.details').forEach(details => {
-                    details.classList.add('show');
-                    const toggle = document.getElementById('toggle-details-' + details.id.replace('details-', ''));
-                    if (toggle) toggle.textContent = 'Hide Details ↑';
-                });
-            }
-            
-            function collapseAllDetails() {
-                document.querySelectorAll('.details').forEach(details => {
-                    details.classList.remove('show');
-                    const toggle = document.getElementById('toggle-details-' + details.id.replace('details-', ''));
-                    if (toggle) toggle.textContent = 'Show Details ↓';
-                });
-            }
-
-            function toggleDetails(channelId) {
-                const details = document.getElementById('details-' + channelId);
-                const toggle = document.getElementById('toggle-details-' + channelId);
-                if (details.classList.contains('show')) {
-                    details.classList.remove('show');
-                    toggle.textContent = 'Show Details ↓';
-                } else {
-                    details.classList.add('show');
-                    toggle.textContent = 'Hide Details ↑';
-                }
-                return false;  // Prevent default link behavior
-            }
-
-            document.addEventListener('DOMContentLoaded', function() {
-                function sortChannels(method) {
-                    const container = document.getElementById('channels-container');
-                    const channels = Array.from(container.getElementsByClassName('channel-item'));
-                    
-                    channels.sort((a, b) => {
-                        if (method === 'alpha') {
-                            return a.getAttribute('data-name').localeCompare(b.getAttribute('data-name'));
-                        } else if (method === 'recent') {
-                            const aDate = a.getAttribute('data-recent-activity') || '';
-                            const bDate = b.getAttribute('data-recent-activity') || '';
-                            return bDate.localeCompare(aDate);
-                        } else if (method === 'active') {
-                            const aCount = parseInt(a.getAttribute('data-message-count') || '0');
-                            const bCount = parseInt(b.getAttribute('data-message-count') || '0');
-                            return bCount - aCount;
-                        }
-                    });
-                    
-                    channels.forEach(channel => {
-                        container.removeChild(channel);
-                        container.appendChild(channel);
-                    });
-                }
+        log('debug', 'Index page generation complete')
+        return ''.join(parts)
 
-                document.getElementById('sort-alpha').addEventListener('click', () => sortChannels('alpha'));
-                document.getElementById('sort-recent').addEventListener('click', () => sortChannels('recent'));
-                document.getElementById('sort-active').addEventListener('click', () => sortChannels('active'));
-            });
-        </script>
-    </body>
-</html>"""
+    def get_channel_summary(self, channel: str) -> str | None:
+        """
+        Return the contents of the channel's summary.txt, or None if there is none.
+        The index page is regenerated after every channel, so contents are cached until the file changes.
+        """
+        summary_path = f"{self.output_dir}/{channel}/summary.txt"
+        try:
+            mtime = os.stat(summary_path).st_mtime_ns
+        except OSError:
+            return None
         
-        log('debug', 'Index page generation complete')
-        return html
+        cached = self._summary_cache.get(summary_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        try:
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                summary = f.read().strip()
+        except Exception as e:
+            log('error', f"Failed to read summary for {channel}: {e}")
+            return None
+        
+        self._summary_cache[summary_path] = (mtime, summary)
+        return summary
 
     def get_channel_stats(self, channel: str) -> Dict[str, int]:
         """Get statistics for a channel"""
-        messages = 0
-        attachments = 0
-        threads = set()
-        earliest_date = None
-        latest_date = None
+        scan = self.scan_channel(channel)
         
-        # Get channel path from zip file using get_data_path
-        channel_path = self.get_data_path(f'export_data/{channel}')
-        
-        if not os.path.exists(channel_path):
+        if not scan:
             log('warning', f"No message data found for {channel} in zip file")
             return {
                 'messages': 0,
@@ -1166,52 +1545,24 @@ class SlackExportViewer:
                 'date_range': None
             }
         
-        for filename in os.listdir(channel_path):
-            if not filename.endswith('.json') or not filename[0].isdigit():
-                continue
-            
-            # Track date range from filenames
-            try:
-                date_str = filename.replace('.json', '')
-                date = datetime.strptime(date_str, '%Y-%m-%d')
-                if not earliest_date or date < earliest_date:
-                    earliest_date = date
-                if not latest_date or date > latest_date:
-                    latest_date = date
-            except ValueError:
-                continue
-            
-            with open(os.path.join(channel_path, filename)) as f:
-                day_messages = json.load(f)
-                messages += len(day_messages)
-                
-                for msg in day_messages:
-                    if 'files' in msg:
-                        attachments += len(msg['files'])
-                    if 'thread_ts' in msg:
-                        threads.add(msg['thread_ts'])
+        earliest_date = scan.earliest_date
+        latest_date = scan.latest_date
         
         # Format date range string
         date_range = None
         if earliest_date and latest_date:
-            if earliest_date.year == latest_date.year:
-                if earliest_date.month == latest_date.month:
-                    date_range = earliest_date.strftime('%B %Y')
-                else:
-                    date_range = f"{earliest_date.strftime('%B')} - {latest_date.strftime('%B %Y')}"
-            else:
-                date_range = f"{earliest_date.strftime('%B %Y')} - {latest_date.strftime('%B %Y')}"
+            date_range = _format_month_range(earliest_date, latest_date)
         
         return {
-            'messages': messages,
-            'attachments': attachments,
-            'threads': len(threads),
+            'messages': scan.messages,
+            'attachments': scan.attachments,
+            'threads': len(scan.threads),
             'date_range': date_range
         }
 
     def process_channel(self, channel: str) -> None:
         """Process a channel's messages and generate HTML and text transcript"""
-        channel_dir = os.path.join(self.output_dir, channel)
+        channel_dir = self.channel_dirs(channel)[0]
         os.makedirs(channel_dir, exist_ok=True)
         
         all_messages = []
@@ -1221,53 +1572,60 @@ class SlackExportViewer:
         
         # Get the channel directory path
         channel_data_path = self.get_data_path(f'export_data/{channel}')
-        if not os.path.exists(channel_data_path):
+        if not self.data_exists(channel_data_path):
             log('warning', f"Channel directory not found: {channel_data_path}")
             return
         
-        # First pass: collect all messages and identify threads
-        for filename in sorted(os.listdir(channel_data_path)):
-            if not filename.endswith('.json'):
-                continue
+        # First pass: collect all messages and identify threads, and gather the
+        # index page totals from the same files so they are only parsed once
+        scan = ChannelScan()
+        for filename, messages in self._iter_message_files(channel_data_path):
+            scan.add_file(filename, messages)
+            for msg in messages:
+                # Add default timestamp for sorting
+                if 'ts' not in msg:
+                    log('warning', f"Message without timestamp in {channel}/{filename}, id: {msg.get('id', 'unknown')}")
+                    msg['ts'] = '0'  # Will sort to the beginning
+                    
+                processed_msg = self.process_message(msg, channel)
+                # Parse the timestamp once for sorting and display
+                ts_float = float(msg['ts'])
+                processed_msg['_ts_float'] = ts_float
+                processed_msg['_dt'] = datetime.fromtimestamp(ts_float)
+                all_messages.append(processed_msg)
                 
-            with open(os.path.join(channel_data_path, filename)) as f:
-                messages = json.load(f)
-                for msg in messages:
-                    # Add default timestamp for sorting
-                    if 'ts' not in msg:
-                        log('warning', f"Message without timestamp in {channel}/{filename}, id: {msg.get('id', 'unknown')}")
-                        msg['ts'] = '0'  # Will sort to the beginning
-                        
-                    processed_msg = self.process_message(msg, channel)
-                    all_messages.append(processed_msg)
+                # Track thread messages
+                thread_ts = msg.get('thread_ts')
+                if thread_ts:
+                    log('debug', f"Found message in thread: ts={msg['ts']}, thread_ts={thread_ts}")
                     
-                    # Track thread messages
-                    thread_ts = msg.get('thread_ts')
-                    if thread_ts:
-                        log('debug', f"Found message in thread: ts={msg['ts']}, thread_ts={thread_ts}")
-                        
-                        # Count replies for this thread
-                        if thread_ts not in thread_reply_counts:
-                            thread_reply_counts[thread_ts] = 0
-                        
-                        # If this is a reply (not the parent)
-                        if thread_ts != msg['ts']:
-                            thread_reply_counts[thread_ts] += 1
-                            messages_with_replies.add(thread_ts)  # Mark the parent message
-                            log('debug', f"Marked message {thread_ts} as having replies (count: {thread_reply_counts[thread_ts]})")
-                        
-                        # Collect all thread messages
-                        if thread_ts not in threads:
-                            threads[thread_ts] = []
-                        threads[thread_ts].append(processed_msg)
-                        log('debug', f"Added message to thread {thread_ts}, total messages: {len(threads[thread_ts])}")
+                    # Count replies for this thread
+                    if thread_ts not in thread_reply_counts:
+                        thread_reply_counts[thread_ts] = 0
+                    
+                    # If this is a reply (not the parent)
+                    if thread_ts != msg['ts']:
+                        thread_reply_counts[thread_ts] += 1
+                        messages_with_replies.add(thread_ts)  # Mark the parent message
+                        log('debug', f"Marked message {thread_ts} as having replies (count: {thread_reply_counts[thread_ts]})")
+                    
+                    # Collect all thread messages
+                    if thread_ts not in threads:
+                        threads[thread_ts] = []
+                    threads[thread_ts].append(processed_msg)
+                    log('debug', f"Added message to thread {thread_ts}, total messages: {len(threads[thread_ts])}")
+
+        self.add_channel_scan(channel, scan)
+        
+        # Downloads run in the background during the first pass
+        self.finish_downloads(channel)
 
         if not all_messages:
             log('warning', f"No valid messages found in channel {channel}")
             return
 
         # Sort all messages by timestamp
-        all_messages.sort(key=lambda x: float(x['ts']))
+        all_messages.sort(key=itemgetter('_ts_float'))
 
         # Mark messages that have replies
         for msg in all_messages:
@@ -1279,23 +1637,24 @@ class SlackExportViewer:
             else:
                 msg['has_replies'] = False
 
-        # Generate main channel page (HTML)
-        channel_html = self.generate_channel_page(channel, all_messages)
-        with open(os.path.join(channel_dir, 'index.html'), 'w', encoding='utf-8') as f:
-            f.write(channel_html)
+        # Generate main channel page (HTML), streamed straight to disk
+        with open(os.path.join(channel_dir, 'index.html'), 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.writelines(self.generate_channel_page(channel, all_messages))
 
         # Generate text transcript
-        channel_text = self.generate_channel_transcript(channel, all_messages, threads)
-        with open(os.path.join(channel_dir, 'index.txt'), 'w', encoding='utf-8') as f:
-            f.write(channel_text)
+        with open(os.path.join(channel_dir, 'index.txt'), 'w', encoding='utf-8',
+                  buffering=WRITE_BUFFER_SIZE) as f:
+            f.writelines(self.generate_channel_transcript(channel, all_messages, threads))
 
         # After processing all messages, write file reports
         self.write_file_reports(channel)
 
-    def generate_channel_transcript(self, channel: str, messages: List[Dict], threads: Dict) -> str:
-        """Generate a text-only transcript of the channel"""
-        transcript = f"Channel: #{channel}\n\n"
+    def generate_channel_transcript(self, channel: str, messages: List[Dict], threads: Dict) -> Iterator[str]:
+        """Generate a text-only transcript of the channel, yielded in chunks"""
+        yield f"Channel: #{channel}\n\n"
         
+        # Usernames come straight from the prebuilt cache, looked up once per message
+        get_username = self.get_username
         current_date = None
         
         for msg in messages:
@@ -1304,24 +1663,24 @@ class SlackExportViewer:
                 continue
 
             # Check if we need to print a new date header
-            msg_date = datetime.fromtimestamp(float(msg['ts'])).strftime('%Y-%m-%d')
+            msg_dt = msg.get('_dt') or datetime.fromtimestamp(float(msg['ts']))
+            msg_date = msg_dt.strftime('%Y-%m-%d')
             if msg_date != current_date:
                 current_date = msg_date
                 # Format date more nicely for display
-                display_date = datetime.fromtimestamp(float(msg['ts'])).strftime('%B %d, %Y')
-                transcript += f"\n=== {display_date} ===\n\n"
+                display_date = msg_dt.strftime('%B %d, %Y')
+                yield f"\n=== {display_date} ===\n\n"
 
-            username = self.get_username(msg.get('user', ''))
+            username = get_username(msg.get('user', ''))
 
             # Format message text
             text = msg.get('text', '')
-            # Replace user mentions with @username
+            # Replace user mentions with @username (most messages have none)
             if '<@' in text:
-                for user_id in self.users_data:
-                    text = text.replace(f'<@{user_id}>', f'@{self.get_username(user_id)}')
+                text = self.replace_mentions(text)
 
             # Basic message
-            transcript += f"{username}:\n    {text}\n"
+            yield f"{username}:\n    {text}\n"
 
             # Handle files
             if 'files' in msg:
@@ -1330,28 +1689,27 @@ class SlackExportViewer:
                     local_path = file_info.get('local_path')
                     if file_info.get('download_failed'):
                         reason = file_info.get('failure_reason', 'unknown reason')
-                        transcript += f"    [File: {name} ({reason})]\n"
+                        yield f"    [File: {name} ({reason})]\n"
                     elif local_path:
-                        transcript += f"    [File: {name} -> {local_path}]\n"
+                        yield f"    [File: {name} -> {local_path}]\n"
                     else:
-                        transcript += f"    [File: {name} (no local path)]\n"
+                        yield f"    [File: {name} (no local path)]\n"
 
             # Handle thread replies
             thread_ts = msg['ts']
             if thread_ts in threads:
-                thread_messages = sorted(threads[thread_ts], key=lambda x: float(x['ts']))
+                thread_messages = sorted(threads[thread_ts], key=_msg_ts)
                 # Skip the parent message (already shown)
                 thread_messages = [m for m in thread_messages if m['ts'] != thread_ts]
                 if thread_messages:
-                    transcript += "    Thread replies:\n"
+                    yield "    Thread replies:\n"
                     for reply in thread_messages:
-                        reply_user = self.get_username(reply.get('user', ''))
+                        reply_user = get_username(reply.get('user', ''))
                         reply_text = reply.get('text', '')
                         # Replace user mentions in replies
                         if '<@' in reply_text:
-                            for user_id in self.users_data:
-                                reply_text = reply_text.replace(f'<@{user_id}>', f'@{self.get_username(user_id)}')
-                        transcript += f"        {reply_user}:\n            {reply_text}\n"
+                            reply_text = self.replace_mentions(reply_text)
+                        yield f"        {reply_user}:\n            {reply_text}\n"
                         
                         # Handle files in replies
                         if 'files' in reply:
@@ -1359,81 +1717,33 @@ class SlackExportViewer:
                                 name = file_info.get('name', 'Unknown file')
                                 local_path = file_info.get('local_path')
                                 if local_path:
-                                    transcript += f"            [File: {name} -> {local_path}]\n"
+                                    yield f"            [File: {name} -> {local_path}]\n"
                                 else:
-                                    transcript += f"            [File: {name} (download failed)]\n"
-                    transcript += "\n"
-
-            transcript += "\n"
+                                    yield f"            [File: {name} (download failed)]\n"
+                    yield "\n"
 
-        return transcript
+            yield "\n"
 
-    def generate_thread_page(self, channel: str, messages: List[Dict]) -> str:
-        """Generate HTML for a thread"""
+    def generate_thread_page(self, channel: str, messages: List[Dict]) -> Iterator[str]:
+        """Generate HTML for a thread, yielded in chunks (one per message)"""
         # Mark all messages as being in thread view
         for msg in messages:
             msg['_in_thread_view'] = True
             
         parent_msg = messages[0]  # First message is the parent
-        parent_time = datetime.fromtimestamp(float(parent_msg['ts'])).strftime('%Y-%m-%d %H:%M:%S')
+        parent_time = _fmt_ts(parent_msg['ts'])
         parent_user = self.get_username(parent_msg.get('user', ''))
         
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Thread in #{channel}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .message {{ margin: 10px 0; padding: 10px; border-bottom: 1px solid #eee; }}
-                .timestamp {{ color: #666; font-size: 0.8em; }}
-                .user {{ font-weight: bold; color: #1264A3; }}
-                .attachment {{ margin: 10px 0; }}
-                .attachment img {{ max-width: 400px; }}
-                .failed-download {{ 
-                    color: #666;
-                    font-style: italic;
-                }}
-                nav {{ margin-bottom: 20px; }}
-                .thumbnail {{
-                    max-width: 200px;
-                    max-height: 200px;
-                    object-fit: contain;
-                    cursor: pointer;
-                }}
-                .thumbnail-link {{
-                    display: inline-block;
-                    text-decoration: none;
-                }}
-                .thread-header {{
-                    margin-bottom: 30px;
-                }}
-                .thread-info {{
-                    color: #666;
-                    font-size: 0.9em;
-                    margin-top: 5px;
-                }}
-            </style>
-        </head>
-        <body>
-            <nav>
-                <a href="index.html">← Back to #{channel}</a>
-            </nav>
-            <div class="thread-header">
-                <h2>Thread in #{channel}</h2>
-                <div class="thread-info">Started by {parent_user} on {parent_time}</div>
-            </div>
-        """
+        fields = {'channel': channel, 'parent_user': parent_user, 'parent_time': parent_time}
+        yield _THREAD_PAGE_TITLE.format_map(fields)
+        yield _THREAD_PAGE_HEAD
+        yield _THREAD_PAGE_INTRO.format_map(fields)
         
         # Generate messages HTML
         for msg in messages:
-            html += self.format_message(msg)
+            yield self.format_message(msg)
         
-        html += """
-        </body>
-        </html>
-        """
-        return html
+        yield _THREAD_PAGE_FOOT
 
     def format_message(self, msg: Dict) -> str:
         """Format a single message for display"""
@@ -1441,97 +1751,105 @@ class SlackExportViewer:
         if 'ts' not in msg or msg['ts'] == '0':
             timestamp_display = "[No Timestamp]"
         else:
-            timestamp_display = datetime.fromtimestamp(float(msg['ts'])).strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Handle text with user mentions and system messages
-        text = msg.get("text", "")
-        
-        # First handle Slack's special formatting
-        # Handle user mentions before escaping
-        if '<@' in text:
-            for user_id in self.users_data:
-                text = text.replace(f'<@{user_id}>', f'@{self.get_username(user_id)}')
-        
-        # Now escape HTML after processing Slack formatting
-        text = html.escape(text)
+            msg_dt = msg.get('_dt') or datetime.fromtimestamp(float(msg['ts']))
+            timestamp_display = msg_dt.strftime('%Y-%m-%d %H:%M:%S')
         
         username = self.get_username(msg.get('user', ''))
         
-        message_html = f"""
+        # Handle blocks if they exist; the plain text (with user mentions, channel
+        # links, URLs and system messages) is only rendered when there are none
+        if 'blocks' in msg:
+            text_html = self.process_blocks(msg["blocks"])
+        else:
+            text_html = self.render_slack_text(msg.get("text", ""))
+        
+        header = f"""
         <div class="message">
             <div class="timestamp">{timestamp_display}</div>
             <div class="user">{username}</div>
-        """
+        <div class="text">{text_html}</div>"""
         
-        # Handle blocks if they exist
-        if 'blocks' in msg:
-            message_html += f'<div class="text">{self.process_blocks(msg["blocks"])}</div>'
-        else:
-            message_html += f'<div class="text">{text}</div>'
+        # Most messages have no files and are built in one piece
+        if 'files' not in msg:
+            return header + '</div>'
         
         # Handle files
-        if 'files' in msg:
-            for file_info in msg['files']:
-                message_html += '<div class="file">'
-                if file_info.get('download_failed'):
-                    message_html += f'<div class="failed-download">File download failed: {file_info.get("name", "Unknown file")}</div>'
-                else:
-                    local_path = file_info.get('local_path')
-                    if local_path:
-                        name = file_info.get('name', 'Unknown file')
-                        # Check file extension for images
-                        image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp'}
-                        is_image = any(local_path.lower().endswith(ext) for ext in image_extensions)
-                        
-                        if is_image:
-                            message_html += f"""
+        parts = [header]
+        for file_info in msg['files']:
+            parts.append('<div class="file">')
+            if file_info.get('download_failed'):
+                parts.append(f'<div class="failed-download">File download failed: {file_info.get("name", "Unknown file")}</div>')
+            else:
+                local_path = file_info.get('local_path')
+                if local_path:
+                    name = file_info.get('name', 'Unknown file')
+                    # Check file extension for images
+                    is_image = local_path.lower().endswith(_IMAGE_EXTENSIONS)
+                    
+                    if is_image:
+                        parts.append(f"""
                             <div class="image-container">
                                 <img src="{local_path}" alt="{name}" class="message-image">
                                 <div class="image-caption">
                                     <a href="{local_path}" target="_blank">{name}</a>
                                 </div>
                             </div>
-                            """
-                        else:
-                            # For non-images, just show the filename as a link
-                            message_html += f'<div class="file-link"><a href="{local_path}" target="_blank">{name}</a></div>'
-                message_html += '</div>'
+                            """)
+                    else:
+                        # For non-images, just show the filename as a link
+                        parts.append(f'<div class="file-link"><a href="{local_path}" target="_blank">{name}</a></div>')
+            parts.append('</div>')
         
-        message_html += '</div>'
-        return message_html
+        parts.append('</div>')
+        return ''.join(parts)
 
     def write_file_reports(self, channel: str) -> None:
         """Write reports of missing and downloaded files for a channel in CSV format"""
-        channel_dir = os.path.join(self.output_dir, channel)
+        channel_dir = self.channel_dirs(channel)[0]
         
         # Write missing files report
-        missing_files = getattr(self, 'channel_missing_files', {}).get(channel, [])
+        missing_files = self.channel_missing_files[channel]
         if missing_files:
-            report_path = os.path.join(channel_dir, 'files_missing.csv')
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write('timestamp,file_id,mode\n')
-                for file in sorted(missing_files, key=lambda x: float(x['timestamp'])):
-                    timestamp = datetime.fromtimestamp(float(file['timestamp'])).strftime('%Y-%m-%d %H:%M:%S')
-                    f.write(f"{timestamp},{file['file_id']},{file['mode']}\n")
+            _write_file_report(os.path.join(channel_dir, 'files_missing.csv'), missing_files)
             log('info', 'Found {count} missing files in channel {channel}', 
                 channel=channel, count=len(missing_files))
         else:
             log('info', 'No missing files found in channel {channel}', channel=channel)
         
         # Write downloaded files report
-        downloaded_files = getattr(self, 'channel_downloaded_files', {}).get(channel, [])
+        downloaded_files = self.channel_downloaded_files[channel]
         if downloaded_files:
-            report_path = os.path.join(channel_dir, 'files_downloaded.csv')
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write('timestamp,file_id,mode\n')
-                for file in sorted(downloaded_files, key=lambda x: float(x['timestamp'])):
-                    timestamp = datetime.fromtimestamp(float(file['timestamp'])).strftime('%Y-%m-%d %H:%M:%S')
-                    f.write(f"{timestamp},{file['file_id']},{file['mode']}\n")
+            _write_file_report(os.path.join(channel_dir, 'files_downloaded.csv'), downloaded_files)
             log('info', 'Found {count} available files in channel {channel}', 
                 channel=channel, count=len(downloaded_files))
         else:
             log('info', 'No files were downloaded in channel {channel}', channel=channel)
 
+# Viewer used by a channel worker process, created by _init_channel_worker
+_worker_viewer = None
+
+def _init_channel_worker(output_dir: str, zip_path: str, usernames: Dict[str, str], download_workers: int) -> None:
+    """Create the viewer for a channel worker process, using usernames resolved by the main process
+    and its share of the download threads"""
+    global _worker_viewer
+    _worker_viewer = SlackExportViewer(output_dir=output_dir, zip_path=zip_path,
+                                       download_workers=download_workers)
+    _worker_viewer.usernames = usernames
+
+def _process_channel_worker(channel: str) -> tuple[str, ChannelScan | None, int, int]:
+    """
+    Process a channel in a worker process.
+    Returns its scan totals for the index page and its missing and available file counts.
+    """
+    _worker_viewer.process_channel(channel)
+    # The channel is finished, so the worker keeps none of its state: the scan totals
+    # go back to the main process and the reports are already written
+    scan = _worker_viewer._channel_scans.pop(channel, None)  # None if the channel has no data
+    missing = len(_worker_viewer.channel_missing_files.pop(channel, []))
+    available = len(_worker_viewer.channel_downloaded_files.pop(channel, []))
+    _worker_viewer.release_channel(channel)
+    return channel, scan, missing, available
+
 def main():
     setup_logging()  # Initialize logging for main execution
     parser = argparse.ArgumentParser(
@@ -1561,6 +1879,8 @@ Examples:
                        help='Output directory path (default: output)')
     parser.add_argument('-force-rewrite', action='store_true',
                        help='Force rewrite all files even if they exist')
+    parser.add_argument('-workers', type=int, default=None,
+                       help='Number of channels to process in parallel (default: number of CPUs)')
     args = parser.parse_args()
     
     # Validate zip file exists
@@ -1569,83 +1889,108 @@ Examples:
         sys.exit(1)
 
     # Create viewer with zip file and specified output directory
-    viewer = SlackExportViewer(output_dir=args.output, zip_path=args.zip_file)
-    
-    # Load channel and user data
-    channels_file = viewer.get_data_path('export_data/channels.json')
-    users_file = viewer.get_data_path('export_data/users.json')
-    
-    if not os.path.exists(channels_file):
-        log('error', 'channels.json not found in zip file')
-        sys.exit(1)
-    if not os.path.exists(users_file):
-        log('error', 'users.json not found in zip file')
-        sys.exit(1)
+    with SlackExportViewer(output_dir=args.output, zip_path=args.zip_file) as viewer:
         
-    viewer.load_channels(channels_file)
-    viewer.load_users(users_file)
-    
-    # Determine channels to process
-    if args.channels_existing:
-        # Use existing directories in output path
-        if not os.path.exists(args.output):
-            log('error', 'Output directory not found: {dir}', dir=args.output)
+        # Load channel and user data
+        channels_file = viewer.get_data_path('export_data/channels.json')
+        users_file = viewer.get_data_path('export_data/users.json')
+        
+        if not viewer.data_exists(channels_file):
+            log('error', 'channels.json not found in zip file')
             sys.exit(1)
-        channels_to_process = [d for d in os.listdir(args.output) 
-                             if os.path.isdir(os.path.join(args.output, d))]
-        if not channels_to_process:
-            log('error', 'No channel directories found in: {dir}', dir=args.output)
+        if not viewer.data_exists(users_file):
+            log('error', 'users.json not found in zip file')
             sys.exit(1)
-    else:
-        channels_to_process = args.channels if args.channels else list(viewer.channels_data.keys())
-    
-    # Validate specified channels exist in the export
-    if args.channels:
-        for channel in channels_to_process:
-            if channel not in viewer.channels_data:
-                log('error', 'Channel not found: {channel}', channel=channel)
+            
+        viewer.load_channels(channels_file)
+        viewer.load_users(users_file)
+        
+        # Determine channels to process
+        if args.channels_existing:
+            # Use existing directories in output path
+            if not os.path.exists(args.output):
+                log('error', 'Output directory not found: {dir}', dir=args.output)
+                sys.exit(1)
+            with os.scandir(args.output) as entries:
+                channels_to_process = [entry.name for entry in entries if entry.is_dir()]
+            if not channels_to_process:
+                log('error', 'No channel directories found in: {dir}', dir=args.output)
                 sys.exit(1)
-    
-    # Create output directory
-    os.makedirs(args.output, exist_ok=True)
-    
-    # Keep track of processed channels
-    processed_channels = []
-    
-    # Process each channel
-    for channel in channels_to_process:
-        channel_dir = os.path.join(args.output, channel)
-        html_path = os.path.join(channel_dir, 'index.html')
-        txt_path = os.path.join(channel_dir, 'index.txt')
-        
-        # Only process if files don't exist or force rewrite is enabled
-        if args.force_rewrite or not os.path.exists(html_path) or not os.path.exists(txt_path):
-            missing = []
-            if args.force_rewrite:
-                missing = ['index.html', 'index.txt']
-                log('info', 'Processing channel {channel} - force rewriting {files} and downloading referenced files', 
-                    channel=channel, files=', '.join(missing))
-            else:
-                if not os.path.exists(html_path):
-                    missing.append('index.html')
-                if not os.path.exists(txt_path):
-                    missing.append('index.txt')
-                log('info', 'Processing channel {channel} - generating {files} and downloading referenced files', 
-                    channel=channel, files=', '.join(missing))
-            viewer.process_channel(channel)
         else:
-            log('info', 'Processing channel {channel} - downloading referenced files', channel=channel)
-            viewer.process_channel(channel)
+            channels_to_process = args.channels if args.channels else list(viewer.channels_data.keys())
         
-        processed_channels.append(channel)
+        # Validate specified channels exist in the export
+        if args.channels:
+            for channel in channels_to_process:
+                if channel not in viewer.channels_data:
+                    log('error', 'Channel not found: {channel}', channel=channel)
+                    sys.exit(1)
+        
+        # Create output directory
+        os.makedirs(args.output, exist_ok=True)
+        
+        # Report what will be done for each channel
+        for channel in channels_to_process:
+            # One directory read per channel instead of a stat per output file
+            try:
+                with os.scandir(os.path.join(args.output, channel)) as entries:
+                    existing = {entry.name for entry in entries}
+            except OSError:
+                existing = set()
+            has_html = 'index.html' in existing
+            has_txt = 'index.txt' in existing
+            
+            # Only process if files don't exist or force rewrite is enabled
+            if args.force_rewrite or not has_html or not has_txt:
+                missing = []
+                if args.force_rewrite:
+                    missing = ['index.html', 'index.txt']
+                    log('info', 'Processing channel {channel} - force rewriting {files} and downloading referenced files', 
+                        channel=channel, files=', '.join(missing))
+                else:
+                    if not has_html:
+                        missing.append('index.html')
+                    if not has_txt:
+                        missing.append('index.txt')
+                    log('info', 'Processing channel {channel} - generating {files} and downloading referenced files', 
+                        channel=channel, files=', '.join(missing))
+            else:
+                log('info', 'Processing channel {channel} - downloading referenced files', channel=channel)
+        
+        # Keep track of processed channels and their file totals
+        processed_channels = []
+        total_missing = 0
+        total_available = 0
+        
+        index_path = os.path.join(args.output, 'index.html')
+        
+        # Process channels in parallel; each worker process has its own viewer, so
+        # don't start more of them than there are channels, and split the download
+        # threads between them
+        workers = max(1, min(args.workers or os.cpu_count() or 1, len(channels_to_process)))
+        download_workers = max(1, DOWNLOAD_WORKERS // workers)
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_channel_worker,
+                                 initargs=(args.output, args.zip_file, viewer.usernames,
+                                           download_workers)) as executor:
+            for channel, scan, missing, available in executor.map(_process_channel_worker, channels_to_process):
+                viewer.add_channel_scan(channel, scan)
+                processed_channels.append(channel)
+                total_missing += missing
+                total_available += available
+                
+                # Always update index page if force rewrite is enabled
+                if args.force_rewrite or len(processed_channels) == len(channels_to_process):
+                    log('debug', 'Updating index.html with {count} channels', count=len(processed_channels))
+                    html = viewer.generate_index_page(processed_channels)
+                    # Encoded once and handed to the OS in a single write, bypassing the
+                    # text layer's chunked encode-and-flush
+                    with open(index_path, 'wb') as f:
+                        f.write(html.encode('utf-8'))
+        
+        log('info', 'Processed {count} channels: {available} files available, {missing} missing',
+            count=len(processed_channels), available=total_available, missing=total_missing)
         
-        # Always update index page if force rewrite is enabled
-        if args.force_rewrite or len(processed_channels) == len(channels_to_process):
-            log('debug', 'Updating index.html with {count} channels', count=len(processed_channels))
-            html = viewer.generate_index_page(processed_channels)
-            with open(os.path.join(args.output, 'index.html'), 'w', encoding='utf-8') as f:
-                f.write(html)
-    
     log('info', 'Done! Open {path}/index.html in your browser to view the export.', 
         path=args.output)
 